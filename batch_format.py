@@ -0,0 +1,118 @@
+"""
+Normalized, dictionary-encoded batch output.
+
+A batch document stores every referenced card exactly once in a shared
+``cards`` table and describes each deck as ``[row, count]`` pairs into it:
+
+    {
+      "format": "hs-batch/1",
+      "cards": [{...}, {...}],
+      "decks": [{"deckCode": "AAEC...", "deckSize": 30, "cards": [[0, 2], [1, 1]]}]
+    }
+
+``deckSize`` is the decoded deck length, which also counts cards missing from
+the table. Decks whose code cannot be decoded keep their slot with an empty card list
+and an ``error`` message, so deck positions always match the input corpus.
+"""
+import json
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, Mapping, Optional
+
+from extract_cards import DataError, DeckCodeError, DeckDecoder, IOErrorEx, _annotate_count, as_plain_dict
+
+BATCH_FORMAT = "hs-batch/1"
+
+CardProjection = Callable[[dict], dict]
+
+
+def encode_batch(
+    deck_codes: Iterable[str],
+    by_id: Mapping[int, dict],
+    deck_decoder: DeckDecoder,
+    project: Optional[CardProjection] = None,
+) -> dict:
+    """
+    Decode each deck code and build a batch document.
+    Cards are projected once, when first referenced; unknown dbfIds are dropped
+    like in filter_cards_by_id. Deck rows are ordered by dbfId for determinism.
+    """
+    rows: dict[int, int] = {}
+    table: list[dict] = []
+    decks: list[dict] = []
+    for code in deck_codes:
+        try:
+            counts = Counter(deck_decoder(code))
+        except DeckCodeError as e:
+            decks.append({"deckCode": code, "cards": [], "error": str(e)})
+            continue
+        pairs: list[list[int]] = []
+        for dbf_id in sorted(counts):
+            row = rows.get(dbf_id)
+            if row is None:
+                card = by_id.get(dbf_id)
+                if card is None:
+                    continue
+                row = rows[dbf_id] = len(table)
+                table.append(project(card) if project else as_plain_dict(card))
+            pairs.append([row, counts[dbf_id]])
+        decks.append({"deckCode": code, "deckSize": sum(counts.values()), "cards": pairs})
+    return {"format": BATCH_FORMAT, "cards": table, "decks": decks}
+
+
+class BatchReader:
+    """
+    Read-side view of a batch document. Decks are rehydrated on demand into the
+    same entry shape the single-deck extractor emits (countFromDeck/displayName).
+    """
+
+    def __init__(self, doc: dict):
+        if not isinstance(doc, dict) or doc.get("format") != BATCH_FORMAT:
+            raise DataError(f"Not a batch document (expected format '{BATCH_FORMAT}').")
+        self._cards: list[dict] = doc.get("cards", [])
+        self._decks: list[dict] = doc.get("decks", [])
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "BatchReader":
+        try:
+            doc = json.loads(Path(path).read_text(encoding="utf-8"))
+        except Exception as e:
+            raise IOErrorEx(f"Error loading batch file: {e}") from e
+        return cls(doc)
+
+    def __len__(self) -> int:
+        return len(self._decks)
+
+    def __iter__(self) -> Iterator[list[dict]]:
+        for i in range(len(self._decks)):
+            yield self.deck(i)
+
+    @property
+    def cards(self) -> list[dict]:
+        """The shared card table (one projected record per dbfId)."""
+        return self._cards
+
+    def deck_code(self, index: int) -> str:
+        return self._decks[index]["deckCode"]
+
+    def deck_error(self, index: int) -> Optional[str]:
+        return self._decks[index].get("error")
+
+    def deck_counts(self, index: int) -> list[tuple[dict, int]]:
+        """(shared card record, count) pairs without copying the records."""
+        return [(self._cards[row], count) for row, count in self._decks[index]["cards"]]
+
+    def deck(self, index: int) -> list[dict]:
+        """
+        Materialize one deck as fresh entry dicts annotated with their counts
+        (and per-card drawOdds when the document carries them).
+        """
+        odds = self._decks[index].get("drawOdds") or []
+        entries = []
+        for i, (card, count) in enumerate(self.deck_counts(index)):
+            entry = dict(card)
+            _annotate_count(entry, count)
+            if i < len(odds):
+                entry["drawOdds"] = odds[i]
+            entries.append(entry)
+        return entries
@@ -0,0 +1,177 @@
+"""
+Pipeline benchmark: per-stage wall time and peak memory on synthetic inputs.
+
+    python benchmarks/bench_pipeline.py                        # quick grid, compared to baseline.json
+    python benchmarks/bench_pipeline.py --cards 1k,30k,200k --decks 1k,100k
+    python benchmarks/bench_pipeline.py --save-baseline benchmarks/baseline.json
+
+Stages (each timed on its own, inputs prepared by the previous stage):
+  load_cards     parse the JSON dump
+  index          build_card_index
+  filter         filter_cards_by_id for one deck's ids
+  decode         decode_deck_code_real over the whole corpus
+  multiplicity   extract_entries (basic) with countFromDeck for every deck
+  serialize      pretty JSON of the multiplicity output
+
+Inputs come from benchmarks/synthetic.py and are cached under --workdir, so
+runs are offline and repeatable. Time is the best of --repeat runs; peak
+memory is measured in a separate tracemalloc run so it does not skew timing.
+A stage regresses when both its time (or memory) grows by more than
+--threshold relative to the baseline and the absolute change exceeds the
+noise floor; the process then exits 1. Baselines are machine-specific:
+re-record one on the machine that runs the comparison.
+"""
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import extract_cards as ec  # noqa: E402
+from benchmarks.synthetic import generate_deck_codes, write_dump  # noqa: E402
+
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baseline.json"
+DEFAULT_WORKDIR = ROOT / "benchmarks" / ".data"
+STAGES = ("load_cards", "index", "filter", "decode", "multiplicity", "serialize")
+MIN_SECONDS = 0.005  # noise floor for time regressions
+MIN_BYTES = 256 * 1024  # noise floor for memory regressions
+
+
+def parse_sizes(text: str) -> list[int]:
+    """'1k,30k,200k' -> [1000, 30000, 200000]."""
+    sizes = []
+    for part in filter(None, (p.strip().lower() for p in text.split(","))):
+        scale = 1000 if part.endswith("k") else 1
+        sizes.append(int(float(part.rstrip("k")) * scale))
+    return sizes
+
+
+def prepare_inputs(workdir: Path, n_cards: int, n_decks: int, seed: int) -> tuple[Path, list[str]]:
+    """Synthetic dump and deck corpus for one case, generated once and cached."""
+    workdir.mkdir(parents=True, exist_ok=True)
+    dump = workdir / f"cards_{n_cards}_s{seed}.json"
+    corpus = workdir / f"decks_{n_cards}_{n_decks}_s{seed}.txt"
+    cards = None
+    if not dump.exists():
+        cards = write_dump(dump, n_cards, seed)
+    if not corpus.exists():
+        if cards is None:
+            cards = json.loads(dump.read_text(encoding="utf-8"))
+        corpus.write_text("\n".join(generate_deck_codes(cards, n_decks, seed)) + "\n", encoding="utf-8")
+    return dump, corpus.read_text(encoding="utf-8").split()
+
+
+def _timed(fn: Callable[[], Any], repeat: int) -> tuple[Any, float]:
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def _peak_bytes(fn: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(dump: Path, codes: list[str], repeat: int) -> dict[str, dict]:
+    """Time and measure every stage for one (dump, corpus) pair."""
+    results: dict[str, dict] = {}
+
+    def stage(name: str, fn: Callable[[], Any]) -> Any:
+        value, seconds = _timed(fn, repeat)
+        results[name] = {"seconds": round(seconds, 6), "peakBytes": _peak_bytes(fn)}
+        return value
+
+    with contextlib.redirect_stderr(io.StringIO()):
+        cards = stage("load_cards", lambda: ec.load_cards(dump))
+    by_id = stage("index", lambda: ec.build_card_index(cards))
+    first_deck = sorted(set(ec.decode_deck_code_real(codes[0])))
+    stage("filter", lambda: ec.filter_cards_by_id(cards, first_deck))
+    decoded = stage("decode", lambda: [ec.decode_deck_code_real(code) for code in codes])
+
+    # Multiplicity reuses the decoded corpus so that decoding is not counted twice.
+    by_code = dict(zip(codes, decoded))
+    resolver = ec.make_multiplicity_resolver(by_code.__getitem__)
+    entries = stage("multiplicity", lambda: [
+        ec.extract_entries(by_id, sorted(set(by_code[code])), code, basic=True, resolver=resolver)
+        for code in codes
+    ])
+    stage("serialize", lambda: ec._dumps(entries))
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Regression messages for stages present in both result sets."""
+    problems = []
+    for case, stages in current.items():
+        for name, now in stages.items():
+            before = baseline.get(case, {}).get(name)
+            if not before:
+                continue
+            for key, floor, unit, scale in (("seconds", MIN_SECONDS, "ms", 1000), ("peakBytes", MIN_BYTES, "KiB", 1 / 1024)):
+                old, new = before[key], now[key]
+                if new > old * (1 + threshold) and new - old > floor:
+                    problems.append(
+                        f"{case} {name}: {key} {old * scale:.1f} -> {new * scale:.1f} {unit} "
+                        f"(+{(new / old - 1) * 100 if old else float('inf'):.0f}%)"
+                    )
+    return problems
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cards", default="1k,30k", help="Dump sizes, e.g. 1k,30k,200k")
+    parser.add_argument("--decks", default="1k", help="Corpus sizes, e.g. 1k,100k")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workdir", default=str(DEFAULT_WORKDIR), help="Cache for generated inputs")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline to compare against")
+    parser.add_argument("--save-baseline", metavar="PATH", help="Write the results as a new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed relative slowdown (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results: dict[str, dict] = {}
+    for n_cards in parse_sizes(args.cards):
+        for n_decks in parse_sizes(args.decks):
+            case = f"cards={n_cards},decks={n_decks}"
+            dump, codes = prepare_inputs(Path(args.workdir), n_cards, n_decks, args.seed)
+            results[case] = run_case(dump, codes, args.repeat)
+            for name, r in results[case].items():
+                print(f"{case:24s} {name:13s} {r['seconds'] * 1000:10.1f} ms {r['peakBytes'] / 2**20:10.1f} MiB")
+
+    if args.save_baseline:
+        doc = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+        Path(args.save_baseline).write_text(json.dumps(doc, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved baseline to {args.save_baseline}", file=sys.stderr)
+        return 0
+
+    baseline_path = Path(args.baseline)
+    if not baseline_path.exists():
+        print(f"No baseline at {baseline_path}; skipping comparison.", file=sys.stderr)
+        return 0
+    problems = compare(results, json.loads(baseline_path.read_text(encoding="utf-8"))["results"], args.threshold)
+    for line in problems:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,63 @@
+"""
+Start-up benchmark: wall time from process spawn to the first byte on STDOUT.
+
+    python benchmarks/bench_startup.py --config tests/test_data/valid_config.json
+    python benchmarks/bench_startup.py --config cfg.json --pyz dist/extract_cards.pyz --max-ms 50
+
+Reports min/median per target; with --max-ms, exits 1 when a target's median
+exceeds the budget so CI can catch start-up regressions.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def time_to_first_byte(cmd: list[str]) -> float:
+    """Seconds until the first STDOUT byte of `cmd` (which must succeed)."""
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    first = proc.stdout.read(1)
+    elapsed = time.perf_counter() - start
+    proc.stdout.read()
+    proc.stdout.close()
+    if proc.wait() != 0 or not first:
+        raise RuntimeError(f"Command failed or produced no output: {' '.join(cmd)}")
+    return elapsed
+
+
+def measure(cmd: list[str], runs: int, warmup: int = 2) -> list[float]:
+    for _ in range(warmup):
+        time_to_first_byte(cmd)
+    return [time_to_first_byte(cmd) for _ in range(runs)]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--config", required=True, help="Config that writes JSON to STDOUT (no outputFile)")
+    parser.add_argument("--pyz", help="Also measure a zipapp built with build_zipapp.py")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--max-ms", type=float, default=None, help="Fail if a median exceeds this budget")
+    args = parser.parse_args(argv)
+
+    targets = {"script": [sys.executable, str(ROOT / "extract_cards.py"), "--config", args.config]}
+    if args.pyz:
+        targets["zipapp"] = [sys.executable, args.pyz, "--config", args.config]
+
+    failed = False
+    for label, cmd in targets.items():
+        samples_ms = [t * 1000 for t in measure(cmd, args.runs)]
+        median = statistics.median(samples_ms)
+        print(f"{label:8s} first byte: min {min(samples_ms):7.1f} ms  median {median:7.1f} ms  ({args.runs} runs)")
+        if args.max_ms is not None and median > args.max_ms:
+            print(f"{label}: median {median:.1f} ms exceeds budget {args.max_ms:.1f} ms", file=sys.stderr)
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
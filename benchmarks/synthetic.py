@@ -0,0 +1,173 @@
+"""
+Deterministic synthetic inputs for the benchmarks: card dumps shaped like
+data/standard_cards_aug_2025.json (same fields, field frequencies and audio2
+payloads) and corpora of real deck codes drawn from them.
+
+    python benchmarks/synthetic.py --cards 30000 --output /tmp/cards_30k.json
+    python benchmarks/synthetic.py --cards 30000 --output /tmp/cards_30k.json --decks 10000 --decks-output /tmp/decks.txt
+
+The same (count, seed) always yields byte-identical files.
+"""
+import argparse
+import json
+import random
+import sys
+from pathlib import Path
+
+CLASSES = [
+    "DEATHKNIGHT", "DEMONHUNTER", "DRUID", "HUNTER", "MAGE", "PALADIN",
+    "PRIEST", "ROGUE", "SHAMAN", "WARLOCK", "WARRIOR",
+]
+# Classic hero dbfIds, written into generated deck codes.
+HERO_DBF_IDS = {
+    "DEATHKNIGHT": 78065, "DEMONHUNTER": 56550, "DRUID": 274, "HUNTER": 31, "MAGE": 637,
+    "PALADIN": 671, "PRIEST": 813, "ROGUE": 930, "SHAMAN": 1066, "WARLOCK": 893, "WARRIOR": 7,
+}
+SETS = [
+    "Core", "Whizbangs_workshop", "Perils_in_paradise", "Great_dark_beyond",
+    "Into_the_emerald_dream", "Lost_city_of_ungoro", "Heroes_of_starcraft", "Boom_Inventions",
+]
+TYPES = [("Minion", 61), ("Spell", 34), ("Weapon", 3), ("Location", 2)]
+RARITIES = [("Common", 42), ("Rare", 27), ("Epic", 15), ("Legendary", 16)]
+MECHANICS = [
+    "BATTLECRY", "DEATHRATTLE", "TAUNT", "DISCOVER", "RUSH", "LIFESTEAL", "DIVINE_SHIELD",
+    "OVERLOAD", "SPELLPOWER", "TRIGGER_VISUAL", "AURA", "COMBO", "SECRET", "CHARGE",
+]
+RACES = ["BEAST", "DEMON", "DRAGON", "ELEMENTAL", "MECHANICAL", "MURLOC", "NAGA", "PIRATE", "UNDEAD"]
+SCHOOLS = ["ARCANE", "FIRE", "FROST", "NATURE", "HOLY", "SHADOW", "FEL"]
+WORDS = [
+    "ancient", "arcane", "blade", "crystal", "dread", "ember", "frost", "grove", "hollow",
+    "iron", "jade", "keeper", "lantern", "molten", "night", "oracle", "prism", "rune",
+    "shadow", "tide", "umbral", "void", "warden", "zealot",
+]
+FIRST_DBF_ID = 100_000
+DECK_SIZE = 30
+
+
+def _pick(rng: random.Random, weighted: list[tuple[str, int]]) -> str:
+    return rng.choices([v for v, _ in weighted], weights=[w for _, w in weighted])[0]
+
+
+def _audio2(rng: random.Random, card_id: str) -> dict:
+    """Play/attack/death voice lines plus, for some cards, extra emote lines (the big payloads)."""
+    voice = f"VO_{card_id}_{rng.choice(['Male', 'Female'])}_{rng.choice(['Human', 'Troll', 'Orc', 'Dragon'])}"
+    audio = {
+        f"BASIC_{event}": {event.title(): {"mainSounds": [f"{voice}_{event.title()}_0{rng.randint(1, 3)}.ogg"]}}
+        for event in ("play", "attack", "death")
+    }
+    if rng.random() < 0.1:
+        for line in rng.sample(["NEED_WEAPON", "NEED_MANA", "MINION_ATTACKED", "I_ATTACKED", "GENERIC"], 4):
+            key = f"{voice}_ERROR_{line}_01"
+            audio[key] = {key: {"mainSounds": [f"{key}.ogg"]}}
+    return audio
+
+
+def generate_card(rng: random.Random, n: int) -> dict:
+    dbf_id = FIRST_DBF_ID + n
+    card_id = f"SYN_{n:06d}"
+    klass = "NEUTRAL" if rng.random() < 0.3 else rng.choice(CLASSES)
+    card_type = _pick(rng, TYPES)
+    name = " ".join(rng.choice(WORDS).title() for _ in range(rng.randint(1, 3)))
+    card: dict = {
+        "id": card_id,
+        "dbfId": dbf_id,
+        "name": f"{name} {n}",
+        "text": f"<b>{rng.choice(MECHANICS).title()}:</b> Deal {rng.randint(1, 8)} damage to a random enemy.",
+        "set": rng.choice(SETS),
+        "cardClass": klass,
+        "playerClass": klass.title(),
+        "classes": [klass],
+        "type": card_type,
+        "collectible": rng.random() < 0.85,
+        "cost": rng.choices(range(11), weights=[3, 12, 16, 15, 13, 10, 8, 6, 4, 2, 2])[0],
+        "rarity": _pick(rng, RARITIES),
+        "artist": f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()}",
+        "flavor": " ".join(rng.choice(WORDS) for _ in range(rng.randint(6, 14))).capitalize() + ".",
+    }
+    if rng.random() < 0.85:
+        card["mechanics"] = sorted(rng.sample(MECHANICS, rng.randint(1, 3)))
+    if card_type in ("Minion", "Weapon"):
+        card["attack"] = rng.randint(0, 10)
+        card["health" if card_type == "Minion" else "durability"] = rng.randint(1, 10)
+    if card_type == "Minion":
+        if rng.random() < 0.6:
+            card["race"] = rng.choice(RACES)
+            card["races"] = [card["race"]]
+        if rng.random() < 0.95:
+            card["audio2"] = _audio2(rng, card_id)
+    if card_type == "Spell" and rng.random() < 0.5:
+        card["spellSchool"] = rng.choice(SCHOOLS)
+    if rng.random() < 0.27:
+        card["referencedTags"] = sorted(rng.sample(MECHANICS, rng.randint(1, 2)))
+    if n and rng.random() < 0.23:
+        card["relatedCardDbfIds"] = [FIRST_DBF_ID + rng.randrange(n)]
+    return card
+
+
+def generate_cards(count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    return [generate_card(rng, n) for n in range(count)]
+
+
+def write_dump(path: str | Path, count: int, seed: int = 0) -> list[dict]:
+    cards = generate_cards(count, seed)
+    Path(path).write_text(json.dumps(cards, ensure_ascii=False, indent=2), encoding="utf-8")
+    return cards
+
+
+def generate_deck_codes(cards: list[dict], count: int, seed: int = 0) -> list[str]:
+    """
+    Legal-shaped 30-card deck codes: one class plus neutrals, collectible
+    cards only, at most one copy of a Legendary and two of anything else.
+    """
+    from hearthstone.deckstrings import write_deckstring
+    from hearthstone.enums import FormatType
+
+    pools: dict[str, list[dict]] = {k: [] for k in CLASSES}
+    for card in cards:
+        if not card.get("collectible"):
+            continue
+        for klass in (CLASSES if card["cardClass"] == "NEUTRAL" else [card["cardClass"]]):
+            pools[klass].append(card)
+    classes = [k for k in CLASSES if sum(1 if c["rarity"] == "Legendary" else 2 for c in pools[k]) >= DECK_SIZE]
+    if not classes:
+        raise ValueError("Card pool too small to build a 30-card deck.")
+
+    rng = random.Random(seed)
+    codes = []
+    for _ in range(count):
+        klass = rng.choice(classes)
+        counts: dict[int, int] = {}
+        size = 0
+        while size < DECK_SIZE:
+            card = rng.choice(pools[klass])
+            limit = 1 if card["rarity"] == "Legendary" else 2
+            if counts.get(card["dbfId"], 0) < limit:
+                counts[card["dbfId"]] = counts.get(card["dbfId"], 0) + 1
+                size += 1
+        codes.append(write_deckstring(sorted(counts.items()), [HERO_DBF_IDS[klass]], FormatType.FT_STANDARD))
+    return codes
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate a synthetic card dump (and deck corpus).")
+    parser.add_argument("--cards", type=int, required=True, help="Number of cards in the dump")
+    parser.add_argument("--output", required=True, help="Path of the JSON dump to write")
+    parser.add_argument("--decks", type=int, default=0, help="Number of deck codes to generate")
+    parser.add_argument("--decks-output", help="Path of the deck code file (one per line)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.decks and not args.decks_output:
+        parser.error("--decks requires --decks-output")
+
+    cards = write_dump(args.output, args.cards, args.seed)
+    print(f"Wrote {len(cards)} cards to {args.output}", file=sys.stderr)
+    if args.decks:
+        codes = generate_deck_codes(cards, args.decks, args.seed)
+        Path(args.decks_output).write_text("\n".join(codes) + "\n", encoding="utf-8")
+        print(f"Wrote {len(codes)} deck codes to {args.decks_output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,84 @@
+"""
+Package the extractor as a single self-contained zipapp.
+
+The archive bundles every top-level module (source plus unchecked-hash .pyc,
+so nothing is compiled at start-up) and a precompiled card index for one
+source. Inside the app, configs whose sourceFile has the same base name as the
+bundled source are served from the embedded index instead of the JSON dump.
+
+    python build_zipapp.py --source data/standard_cards_aug_2025.json --output dist/extract_cards.pyz
+    python dist/extract_cards.pyz --config config.json
+"""
+import argparse
+import py_compile
+import shutil
+import sys
+import tempfile
+import zipapp
+from pathlib import Path
+
+from extract_cards import INDEX_SUFFIX, ConfigError, DataError, IOErrorEx, dump_card_index, load_cards
+
+ROOT = Path(__file__).resolve().parent
+INDEX_NAME = "cards" + INDEX_SUFFIX
+
+_MAIN_TEMPLATE = '''\
+# Generated by build_zipapp.py; do not edit.
+import extract_cards
+
+extract_cards.register_embedded_source({source_name!r}, lambda: __loader__.get_data({index_name!r}))
+raise SystemExit(extract_cards.main())
+'''
+
+
+def _app_modules() -> list[Path]:
+    return sorted(p for p in ROOT.glob("*.py") if p.name != Path(__file__).name)
+
+
+def build_zipapp(source_file: str | Path, output: str | Path, interpreter: str | None = None) -> Path:
+    """Write the zipapp to `output` and return its path."""
+    source = Path(source_file)
+    cards = load_cards(source)
+    out = Path(output)
+    try:
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            staging = Path(tmp)
+            for module in _app_modules():
+                target = staging / module.name
+                shutil.copyfile(module, target)
+                py_compile.compile(
+                    str(target),
+                    cfile=str(target.with_suffix(".pyc")),
+                    doraise=True,
+                    invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+                )
+            (staging / INDEX_NAME).write_bytes(dump_card_index(cards))
+            (staging / "__main__.py").write_text(
+                _MAIN_TEMPLATE.format(source_name=source.name, index_name=INDEX_NAME),
+                encoding="utf-8",
+            )
+            # Stored (uncompressed) members: reading them back costs no inflate time.
+            zipapp.create_archive(staging, out, interpreter=interpreter)
+    except (OSError, py_compile.PyCompileError) as e:
+        raise IOErrorEx(f"Error building zipapp: {e}") from e
+    return out
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build a self-contained extractor zipapp.")
+    parser.add_argument("--source", required=True, help="Card source JSON to embed as a precompiled index")
+    parser.add_argument("--output", default="dist/extract_cards.pyz", help="Path of the .pyz to write")
+    parser.add_argument("--python", default=None, help="Interpreter for the shebang line (e.g. '/usr/bin/env python3')")
+    args = parser.parse_args(argv)
+    try:
+        out = build_zipapp(args.source, args.output, args.python)
+    except (ConfigError, DataError, IOErrorEx) as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    print(f"Zipapp written to {out}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,146 @@
+"""
+Thread-safe library API over a loaded card source.
+
+A CardRepository holds one immutable CardSnapshot (cards + dbfId index).
+Readers grab the current snapshot with a single attribute read and use it for
+the whole request, so they never lock. reload()/swap() build or accept a new
+snapshot and publish it with one reference assignment; in-flight readers keep
+the snapshot they already hold.
+
+Locale overlays (see locales) hang off the snapshot: each locale is loaded on
+its first request and shares the snapshot's structural records and index.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Iterable, Mapping, Optional
+
+from extract_cards import (
+    DeckDecoder,
+    MultiplicityResolver,
+    build_card_index,
+    decode_deck_code_real,
+    extract_entries,
+    load_cards,
+    make_multiplicity_resolver,
+    resolve_ids_from_config,
+    to_basic_fields,
+)
+from locales import LocaleCatalog
+
+
+@dataclass(frozen=True)
+class CardSnapshot:
+    """
+    Loaded, indexed view of one source. Card dicts are shared between
+    readers and must be treated as read-only; extraction returns copies.
+    """
+    source: str
+    cards: tuple[dict, ...]
+    by_id: Mapping[int, dict]
+    loaded_at: float
+    compact: bool = False
+    locales: Optional[LocaleCatalog] = field(default=None, compare=False, repr=False)
+
+    def __post_init__(self):
+        if self.locales is None:
+            source = None if self.source.startswith("<") else self.source
+            object.__setattr__(self, "locales", LocaleCatalog(self.by_id, source))
+
+    def index(self, locale: Optional[str] = None) -> Mapping[int, Mapping]:
+        """dbfId index in the given locale (None: the base dump)."""
+        return self.locales.index(locale)
+
+    @classmethod
+    def from_cards(
+        cls, cards: Iterable[dict], source: str = "<memory>", compact: bool = False
+    ) -> "CardSnapshot":
+        cards = tuple(cards)
+        return cls(
+            source=source,
+            cards=cards,
+            by_id=MappingProxyType(build_card_index(cards)),
+            loaded_at=time.time(),
+            compact=compact,
+        )
+
+    @classmethod
+    def load(cls, source_file: str | Path, compact: bool = False) -> "CardSnapshot":
+        """compact=True stores CompactCard records (see compact_cards)."""
+        return cls.from_cards(load_cards(source_file, compact), str(source_file), compact)
+
+
+class CardRepository:
+    """
+    Serve extraction requests from the current snapshot. Decoder and resolver
+    are per-call parameters; the module-level hooks in extract_cards are not used.
+    """
+
+    def __init__(self, snapshot: CardSnapshot):
+        self._snapshot = snapshot
+        # Serializes writers only; readers never touch it.
+        self._swap_lock = threading.Lock()
+
+    @classmethod
+    def load(cls, source_file: str | Path, compact: bool = False) -> "CardRepository":
+        return cls(CardSnapshot.load(source_file, compact))
+
+    @property
+    def snapshot(self) -> CardSnapshot:
+        return self._snapshot
+
+    def swap(self, snapshot: CardSnapshot) -> CardSnapshot:
+        """Publish a new snapshot atomically and return the previous one."""
+        with self._swap_lock:
+            previous, self._snapshot = self._snapshot, snapshot
+        return previous
+
+    def reload(self, source_file: str | Path | None = None) -> CardSnapshot:
+        """
+        Load source_file (default: the current snapshot's source) and swap it in,
+        keeping the current record representation (plain or compact).
+        Loading happens before the swap, so readers are never blocked by I/O.
+        """
+        current = self._snapshot
+        fresh = CardSnapshot.load(source_file or current.source, current.compact)
+        self.swap(fresh)
+        return fresh
+
+    def get(self, dbf_id: int, locale: Optional[str] = None) -> Optional[Mapping]:
+        return self._snapshot.index(locale).get(dbf_id)
+
+    def extract(
+        self,
+        ids: Iterable[int] = (),
+        deck_code: Optional[str] = None,
+        *,
+        basic: bool = False,
+        deck_decoder: DeckDecoder = decode_deck_code_real,
+        multiplicity_resolver: Optional[MultiplicityResolver] = None,
+        locale: Optional[str] = None,
+    ) -> list[dict]:
+        """
+        Same semantics as the CLI 'extract' mode: union of deck_code and ids,
+        sorted, projected, with countFromDeck/displayName when deck_code is given.
+        """
+        snap = self._snapshot
+        cfg = {"deckCode": deck_code, "ids": list(ids)}
+        resolved = resolve_ids_from_config(cfg, deck_decoder)
+        resolver = multiplicity_resolver or make_multiplicity_resolver(deck_decoder)
+        return extract_entries(snap.index(locale), resolved, deck_code, basic, resolver)
+
+    def extract_batch(
+        self,
+        deck_codes: Iterable[str],
+        *,
+        basic: bool = False,
+        deck_decoder: DeckDecoder = decode_deck_code_real,
+        locale: Optional[str] = None,
+    ) -> dict:
+        """Encode many decks into a batch document (see batch_format)."""
+        from batch_format import encode_batch
+
+        snap = self._snapshot
+        return encode_batch(deck_codes, snap.index(locale), deck_decoder, to_basic_fields if basic else None)
@@ -0,0 +1,223 @@
+"""
+SQLite-backed card store: one durable, indexed artifact per card dump.
+
+Hot fields are indexed columns, the full record is kept as JSON, and
+mechanics, races and related cards live in join tables. The database is
+written once by import_cards() (into a temp file that is renamed into place)
+and never modified afterwards. It stays in rollback-journal mode: a WAL
+database needs write access to its directory even for readers, whereas this
+way any number of processes can open it read-only (also from a read-only
+directory) and share the page cache instead of each parsing the JSON dump.
+
+    python card_store.py --source data/standard_cards_aug_2025.json --output data/standard.sqlite
+
+Any extractor config can then use the .sqlite file as its sourceFile.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Optional
+
+from extract_cards import CARD_STORE_SUFFIXES, ConfigError, DataError, IOErrorEx, is_card_store, load_cards
+
+SCHEMA_VERSION = 1
+_MAX_PARAMS = 900  # stay below SQLITE_MAX_VARIABLE_NUMBER on old builds
+
+_SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE cards (
+    dbf_id      INTEGER PRIMARY KEY,
+    ord         INTEGER NOT NULL,
+    card_id     TEXT,
+    name        TEXT,
+    cost        INTEGER,
+    card_class  TEXT,
+    type        TEXT,
+    rarity      TEXT,
+    card_set    TEXT,
+    collectible INTEGER,
+    record      TEXT NOT NULL
+);
+CREATE INDEX idx_cards_name ON cards (name);
+CREATE INDEX idx_cards_cost ON cards (cost);
+CREATE INDEX idx_cards_class ON cards (card_class);
+CREATE INDEX idx_cards_type ON cards (type);
+CREATE INDEX idx_cards_set ON cards (card_set);
+CREATE TABLE card_mechanics (dbf_id INTEGER NOT NULL, mechanic TEXT NOT NULL);
+CREATE INDEX idx_mechanics ON card_mechanics (mechanic, dbf_id);
+CREATE TABLE card_races (dbf_id INTEGER NOT NULL, race TEXT NOT NULL);
+CREATE INDEX idx_races ON card_races (race, dbf_id);
+CREATE TABLE card_related (dbf_id INTEGER NOT NULL, related_dbf_id INTEGER NOT NULL);
+CREATE INDEX idx_related ON card_related (dbf_id);
+CREATE INDEX idx_related_reverse ON card_related (related_dbf_id);
+"""
+
+
+def _card_row(ord_: int, card: Mapping) -> tuple:
+    collectible = card.get("collectible")
+    return (
+        card["dbfId"], ord_, card.get("id"), card.get("name"), card.get("cost"),
+        card.get("cardClass"), card.get("type"), card.get("rarity"), card.get("set"),
+        None if collectible is None else int(bool(collectible)),
+        json.dumps(card, ensure_ascii=False, separators=(",", ":")),
+    )
+
+
+def import_cards(source_file: str | Path, db_path: str | Path) -> int:
+    """
+    Build a store from a card dump (JSON or .hsidx). Cards without an integer
+    dbfId are skipped; for duplicate dbfIds the later card wins, as in
+    build_card_index. Returns the number of stored cards.
+    """
+    cards = [c for c in load_cards(source_file) if isinstance(c.get("dbfId"), int)]
+    by_id = {c["dbfId"]: (i, c) for i, c in enumerate(cards)}
+    target = Path(db_path)
+    tmp = target.with_name(target.name + ".tmp")
+    try:
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp.unlink(missing_ok=True)
+        con = sqlite3.connect(tmp)
+        try:
+            con.executescript(_SCHEMA)
+            with con:
+                con.executemany("INSERT INTO meta VALUES (?, ?)", [
+                    ("schemaVersion", str(SCHEMA_VERSION)),
+                    ("source", Path(source_file).name),
+                    ("cards", str(len(by_id))),
+                ])
+                con.executemany(
+                    "INSERT INTO cards VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (_card_row(i, c) for i, c in by_id.values()),
+                )
+                con.executemany(
+                    "INSERT INTO card_mechanics VALUES (?, ?)",
+                    ((d, m) for d, (_, c) in by_id.items() for m in c.get("mechanics") or ()),
+                )
+                con.executemany(
+                    "INSERT INTO card_races VALUES (?, ?)",
+                    ((d, r) for d, (_, c) in by_id.items() for r in c.get("races") or ()),
+                )
+                con.executemany(
+                    "INSERT INTO card_related VALUES (?, ?)",
+                    ((d, r) for d, (_, c) in by_id.items() for r in c.get("relatedCardDbfIds") or ()),
+                )
+            con.execute("ANALYZE")
+        finally:
+            con.close()
+        os.replace(tmp, target)
+    except (OSError, sqlite3.Error) as e:
+        raise IOErrorEx(f"Error writing card store: {e}") from e
+    return len(by_id)
+
+
+class CardStore(Mapping):
+    """
+    Read-only Mapping dbfId -> card over a store. Open one per thread or
+    process (the underlying connection is not shared across threads).
+    """
+
+    def __init__(self, connection: sqlite3.Connection, path: Path):
+        self._con = connection
+        self.path = path
+
+    @classmethod
+    def open(cls, db_path: str | Path) -> "CardStore":
+        path = Path(db_path)
+        if not path.exists():
+            raise IOErrorEx(f"Error opening card store: {path} does not exist")
+        try:
+            con = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+            version = con.execute("SELECT value FROM meta WHERE key = 'schemaVersion'").fetchone()
+        except sqlite3.Error as e:
+            raise IOErrorEx(f"Error opening card store: {e}") from e
+        if version is None or int(version[0]) != SCHEMA_VERSION:
+            con.close()
+            raise DataError("Card store schema version mismatch; re-import it with card_store.py.")
+        return cls(con, path)
+
+    def close(self) -> None:
+        self._con.close()
+
+    def __enter__(self) -> "CardStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # -- Mapping protocol -----------------------------------------------------
+
+    def __getitem__(self, dbf_id: int) -> dict:
+        row = self._con.execute("SELECT record FROM cards WHERE dbf_id = ?", (dbf_id,)).fetchone()
+        if row is None:
+            raise KeyError(dbf_id)
+        return json.loads(row[0])
+
+    def __contains__(self, dbf_id: object) -> bool:
+        return self._con.execute("SELECT 1 FROM cards WHERE dbf_id = ?", (dbf_id,)).fetchone() is not None
+
+    def __iter__(self) -> Iterator[int]:
+        return (row[0] for row in self._con.execute("SELECT dbf_id FROM cards ORDER BY ord"))
+
+    def __len__(self) -> int:
+        return self._con.execute("SELECT COUNT(*) FROM cards").fetchone()[0]
+
+    # -- Queries --------------------------------------------------------------
+
+    def subset(self, dbf_ids: Iterable[int]) -> dict[int, dict]:
+        """dbfId -> card for the requested ids that exist, via primary-key lookups."""
+        ids = list(dict.fromkeys(dbf_ids))
+        out: dict[int, dict] = {}
+        for start in range(0, len(ids), _MAX_PARAMS):
+            batch = ids[start:start + _MAX_PARAMS]
+            marks = ",".join("?" * len(batch))
+            for dbf_id, record in self._con.execute(
+                f"SELECT dbf_id, record FROM cards WHERE dbf_id IN ({marks})", batch
+            ):
+                out[dbf_id] = json.loads(record)
+        return out
+
+    def all_cards(self) -> list[dict]:
+        """Every stored card in source order."""
+        return [json.loads(r) for (r,) in self._con.execute("SELECT record FROM cards ORDER BY ord")]
+
+    def ids_with_mechanic(self, mechanic: str) -> list[int]:
+        return [r for (r,) in self._con.execute(
+            "SELECT dbf_id FROM card_mechanics WHERE mechanic = ? ORDER BY dbf_id", (mechanic,)
+        )]
+
+    def ids_with_race(self, race: str) -> list[int]:
+        return [r for (r,) in self._con.execute(
+            "SELECT dbf_id FROM card_races WHERE race = ? ORDER BY dbf_id", (race,)
+        )]
+
+    def related_ids(self, dbf_id: int) -> list[int]:
+        return [r for (r,) in self._con.execute(
+            "SELECT related_dbf_id FROM card_related WHERE dbf_id = ?", (dbf_id,)
+        )]
+
+    def meta(self, key: str) -> Optional[str]:
+        row = self._con.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Import a card dump into a SQLite card store.")
+    parser.add_argument("--source", required=True, help="Card source JSON (or .hsidx) to import")
+    parser.add_argument("--output", required=True, help="Path of the .sqlite store to write")
+    args = parser.parse_args(argv)
+    if not is_card_store(args.output):
+        parser.error(f"--output must end with one of: {', '.join(CARD_STORE_SUFFIXES)}")
+    try:
+        count = import_cards(args.source, args.output)
+    except (ConfigError, DataError, IOErrorEx) as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    print(f"Imported {count} cards into {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
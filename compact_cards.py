@@ -0,0 +1,129 @@
+"""
+Compact, read-only card records for long-lived processes.
+
+A CompactCard stores its values in one tuple and shares its key layout (a
+_Shape) with every card that has the same keys in the same order. Strings of
+highly repetitive fields are interned, scalar lists become tuples, and nested
+or bulky values (audio2, tags, additionalCosts, ...) are kept as compact JSON
+text that is decoded on access. to_dict() rebuilds a plain dict that
+json.dumps() serializes exactly like the original record.
+"""
+import json
+import sys
+from collections.abc import Mapping
+from typing import Any, Iterable, Iterator
+
+# Fields whose string values repeat across thousands of cards.
+INTERNED_FIELDS = frozenset({
+    "set", "cardClass", "playerClass", "classes", "type", "rarity", "race", "races",
+    "mechanics", "referencedTags", "spellSchool", "faction", "artist", "touristFor",
+})
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+class _Shape:
+    __slots__ = ("keys", "pos")
+
+    def __init__(self, keys: tuple[str, ...]):
+        self.keys = keys
+        self.pos = {k: i for i, k in enumerate(keys)}
+
+
+class _Packed:
+    """A nested value held as compact JSON text until someone reads it."""
+    __slots__ = ("text",)
+
+    def __init__(self, value: Any):
+        self.text = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+    def decode(self) -> Any:
+        return json.loads(self.text)
+
+
+class CompactCard(Mapping):
+    """
+    Mapping view of one card. Scalar lists read back as tuples (the record is
+    immutable); packed values are decoded into fresh objects on each access.
+    """
+    __slots__ = ("_shape", "_values")
+
+    def __init__(self, shape: _Shape, values: tuple):
+        self._shape = shape
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        value = self._values[self._shape.pos[key]]
+        return value.decode() if type(value) is _Packed else value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._shape.pos
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._shape.keys)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompactCard):
+            other = other.to_dict()
+        return isinstance(other, Mapping) and self.to_dict() == dict(other)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"CompactCard({self.to_dict()!r})"
+
+    def to_dict(self) -> dict:
+        """Plain dict with the original key order and list/dict value types."""
+        out = {}
+        for key, value in zip(self._shape.keys, self._values):
+            if type(value) is _Packed:
+                value = value.decode()
+            elif type(value) is tuple:
+                value = list(value)
+            out[key] = value
+        return out
+
+
+class CardCompactor:
+    """
+    Converts dict records to CompactCards, sharing shapes between calls.
+    Use one compactor per process to share shapes across several sources.
+    """
+
+    def __init__(self):
+        self._shapes: dict[tuple[str, ...], _Shape] = {}
+
+    def _shape_for(self, keys: tuple[str, ...]) -> _Shape:
+        shape = self._shapes.get(keys)
+        if shape is None:
+            shape = self._shapes[keys] = _Shape(tuple(sys.intern(k) for k in keys))
+        return shape
+
+    @staticmethod
+    def _pack_value(key: str, value: Any) -> Any:
+        if isinstance(value, str):
+            return sys.intern(value) if key in INTERNED_FIELDS else value
+        if isinstance(value, list):
+            if not all(isinstance(v, _SCALARS) for v in value):
+                return _Packed(value)
+            if key in INTERNED_FIELDS:
+                return tuple(sys.intern(v) if isinstance(v, str) else v for v in value)
+            return tuple(value)
+        if isinstance(value, dict):
+            return _Packed(value)
+        return value
+
+    def compact(self, card: dict) -> CompactCard:
+        keys = tuple(card)
+        values = tuple(self._pack_value(k, v) for k, v in card.items())
+        return CompactCard(self._shape_for(keys), values)
+
+    def compact_all(self, cards: Iterable[dict]) -> list[CompactCard]:
+        return [self.compact(c) for c in cards]
+
+
+def compact_cards(cards: Iterable[dict]) -> list[CompactCard]:
+    return CardCompactor().compact_all(cards)
@@ -0,0 +1,166 @@
+"""
+Seeded Monte Carlo simulator for opening hands, mulligans and mana-curve hits.
+
+Every simulated game is one row of a (games x deck_size) cost matrix, shuffled
+with batched NumPy permutations. A mulligan policy marks the hand cards to
+throw back; replacements come from the top of the deck and the returned cards
+are then shuffled into the remainder, all as array operations.
+
+Work is split into fixed-size chunks, each with its own child seed spawned from
+the caller's seed, so results depend only on (seed, games, chunk_size) and not
+on how many worker processes run the chunks.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Mapping, Optional, Sequence
+
+import numpy as np
+
+from extract_cards import ConfigError, DataError
+
+DEFAULT_TURNS = 10
+DEFAULT_CHUNK = 50_000
+HAND_SIZE = {"play": 3, "coin": 4}
+
+# policy(hand_costs: int array (games, hand)) -> bool array, True = mulligan that card
+MulliganPolicy = Callable[[np.ndarray], np.ndarray]
+
+
+def keep_all(hand: np.ndarray) -> np.ndarray:
+    return np.zeros(hand.shape, dtype=bool)
+
+
+def max_cost(hand: np.ndarray, limit: int = 3) -> np.ndarray:
+    """Throw back everything that costs more than `limit`."""
+    return hand > limit
+
+
+def curve(hand: np.ndarray, limit: int = 3) -> np.ndarray:
+    """Like max_cost, and also throw back duplicates of a cost already kept."""
+    same = hand[:, :, None] == hand[:, None, :]
+    earlier = np.tril(np.ones((hand.shape[1],) * 2, dtype=bool), k=-1)
+    duplicate = (same & earlier[None, :, :]).any(axis=2)
+    return (hand > limit) | duplicate
+
+
+MULLIGAN_POLICIES: dict[str, Callable[..., np.ndarray]] = {
+    "keep_all": keep_all,
+    "max_cost": max_cost,
+    "curve": curve,
+}
+
+
+def mulligan_policy(spec: str | Mapping | MulliganPolicy | None) -> MulliganPolicy:
+    """
+    Resolve a policy from a name ('curve'), a config object
+    ({"policy": "max_cost", "maxCost": 2}) or a callable (returned as is;
+    it must be picklable to run in worker processes).
+    """
+    if spec is None:
+        return keep_all
+    if callable(spec):
+        return spec
+    name, limit = (spec, None) if isinstance(spec, str) else (spec.get("policy"), spec.get("maxCost"))
+    if name not in MULLIGAN_POLICIES:
+        raise ConfigError(f"Unknown mulligan policy {name!r}; use one of: {', '.join(MULLIGAN_POLICIES)}.")
+    policy = MULLIGAN_POLICIES[name]
+    return partial(policy, limit=int(limit)) if limit is not None and policy is not keep_all else policy
+
+
+def deck_costs(counts: Mapping[int, int], by_id: Mapping[int, Mapping]) -> np.ndarray:
+    """Expand {dbfId: count} into one cost per card copy using the card records."""
+    costs: list[int] = []
+    for dbf_id, count in counts.items():
+        card = by_id.get(dbf_id)
+        if card is None or not isinstance(card.get("cost"), int):
+            raise DataError(f"Card {dbf_id} is missing from the source or has no 'cost'.")
+        costs.extend([card["cost"]] * int(count))
+    return np.asarray(costs, dtype=np.int16)
+
+
+def _after_mulligan(decks: np.ndarray, hand: int, policy: MulliganPolicy, rng: np.random.Generator) -> np.ndarray:
+    """Rows reordered so the first `hand` columns are the kept hand and the rest the reshuffled deck."""
+    games, size = decks.shape
+    throw = policy(decks[:, :hand])
+    replaced = throw.sum(axis=1)
+    # False = in hand after the mulligan, True = back in the deck
+    in_deck = np.zeros((games, size), dtype=bool)
+    in_deck[:, :hand] = throw
+    in_deck[:, hand:] = np.arange(hand, size)[None, :] >= (hand + replaced)[:, None]
+    order = np.argsort(in_deck.astype(np.float32) + rng.random((games, size), dtype=np.float32), axis=1)
+    return np.take_along_axis(decks, order, axis=1)
+
+
+def _simulate_chunk(costs: np.ndarray, games: int, seed: np.random.SeedSequence, turns: int, policy: MulliganPolicy) -> np.ndarray:
+    """Hit counts shaped (side, metric, turn): side play/coin, metric onCurve/castable."""
+    rng = np.random.default_rng(seed)
+    decks = rng.permuted(np.tile(costs, (games, 1)), axis=1)
+    counts = np.zeros((2, 2, turns), dtype=np.int64)
+    for side, hand in enumerate(HAND_SIZE.values()):
+        dealt = _after_mulligan(decks, hand, policy, rng)
+        cheapest = np.minimum.accumulate(dealt[:, :hand + turns], axis=1)
+        for t in range(1, turns + 1):
+            seen = hand + t
+            counts[side, 0, t - 1] = np.count_nonzero((dealt[:, :seen] == t).any(axis=1))
+            counts[side, 1, t - 1] = np.count_nonzero(cheapest[:, seen - 1] <= t)
+    return counts
+
+
+def _run_task(task: tuple) -> tuple[int, np.ndarray]:
+    deck_index, costs, games, seed, turns, policy = task
+    return deck_index, _simulate_chunk(costs, games, seed, turns, policy)
+
+
+def simulate_decks(
+    decks: Sequence[np.ndarray],
+    games: int = 100_000,
+    seed: int = 0,
+    turns: int = DEFAULT_TURNS,
+    policy: str | Mapping | MulliganPolicy | None = None,
+    workers: Optional[int] = 1,
+    chunk_size: int = DEFAULT_CHUNK,
+) -> list[dict]:
+    """
+    Simulate `games` games per deck (decks given as cost arrays, see deck_costs)
+    and return one report per deck:
+        {"games", "seed", "play": {"onCurve": [...], "castable": [...]}, "coin": {...}}
+    onCurve[t-1] is the rate of holding a card costing exactly t by turn t;
+    castable[t-1] the rate of holding any card costing at most t.
+    workers > 1 (or None for all cores) spreads chunks over a process pool.
+    """
+    for name, value in (("games", games), ("chunk_size", chunk_size)):
+        if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise ConfigError(f"'{name}' must be a positive integer.")
+    resolved = mulligan_policy(policy)
+    root = np.random.SeedSequence(seed)
+    tasks = []
+    for deck_index, (costs, deck_seed) in enumerate(zip(decks, root.spawn(len(decks)))):
+        costs = np.asarray(costs, dtype=np.int16)
+        if costs.size < HAND_SIZE["coin"] + turns:
+            raise DataError(f"Deck {deck_index} has {costs.size} cards; too few to simulate {turns} turns.")
+        sizes = [chunk_size] * (games // chunk_size) + ([games % chunk_size] if games % chunk_size else [])
+        for size, chunk_seed in zip(sizes, deck_seed.spawn(len(sizes))):
+            tasks.append((deck_index, costs, size, chunk_seed, turns, resolved))
+
+    totals = np.zeros((len(decks), 2, 2, turns), dtype=np.int64)
+    if workers == 1 or len(tasks) == 1:
+        for deck_index, counts in map(_run_task, tasks):
+            totals[deck_index] += counts
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for deck_index, counts in pool.map(_run_task, tasks, chunksize=max(1, len(tasks) // 64)):
+                totals[deck_index] += counts
+
+    reports = []
+    for deck_totals in totals:
+        rates = (deck_totals / games).round(4)
+        report = {"games": games, "seed": seed}
+        for side, name in enumerate(HAND_SIZE):
+            report[name] = {"onCurve": rates[side, 0].tolist(), "castable": rates[side, 1].tolist()}
+        reports.append(report)
+    return reports
+
+
+def simulate_deck(costs: np.ndarray, games: int = 100_000, seed: int = 0, **kwargs) -> dict:
+    """Single-deck convenience wrapper around simulate_decks."""
+    return simulate_decks([costs], games, seed, **kwargs)[0]
@@ -0,0 +1,144 @@
+"""
+Canonical identities for deck codes.
+
+Many deck code strings encode the same decklist: they differ in hero (skins),
+format byte or card ordering. deck_fingerprint() hashes the decoded multiset
+of cards (BLAKE2b over the sorted "dbfId:count" pairs, plus the sorted
+"dbfId:count:owner" sideboard triples of cards like E.T.C. or Zilliax), so all
+of them map to one fingerprint. canonical_deckstring() re-encodes a code with
+sorted cards, the wild format byte and, given a card index, the default hero
+of the deck's class.
+
+A deck's class is the class of its encoded hero, or the card vote when the
+hero is unknown. Given a card index, DeckDeduper also keys decks by that
+class, so the same multi-class cards under two classes' heroes stay apart.
+It streams a corpus through a hash set of 16-byte digests and keeps one code
+plus an occurrence count per unique deck.
+"""
+import hashlib
+from collections import Counter
+from typing import Iterable, Mapping, Optional
+
+from extract_cards import (
+    DEFAULT_HERO_DBF_IDS,
+    DeckCodeError,
+    DeckParser,
+    ParsedDeck,
+    hero_class,
+    infer_deck_class,
+    parse_deck_code_real,
+)
+
+DIGEST_SIZE = 16
+
+
+def _digest(
+    dbf_ids: Iterable[int], sideboards: Iterable[tuple[int, int, int]] = (), deck_class: Optional[str] = None
+) -> bytes:
+    counts = Counter(dbf_ids)
+    key = ",".join(f"{d}:{counts[d]}" for d in sorted(counts))
+    key += "|" + ",".join(f"{d}:{n}:{owner}" for d, n, owner in sorted(sideboards))
+    if deck_class:
+        key += "|" + deck_class
+    return hashlib.blake2b(key.encode("ascii"), digest_size=DIGEST_SIZE).digest()
+
+
+def deck_fingerprint(
+    dbf_ids: Iterable[int], sideboards: Iterable[tuple[int, int, int]] = (), deck_class: Optional[str] = None
+) -> str:
+    """
+    Order-independent fingerprint of a decoded deck (one dbfId per copy), its
+    sideboards as (dbfId, count, owner dbfId) triples and, optionally, its class.
+    """
+    return _digest(dbf_ids, sideboards, deck_class).hex()
+
+
+def deck_class(deck: ParsedDeck, by_id: Mapping[int, Mapping]) -> str:
+    """Class of the encoded hero; the card vote when the hero is unknown."""
+    return hero_class(deck.hero, by_id) or infer_deck_class(deck.cards, by_id)
+
+
+def _canonical(deck: ParsedDeck, by_id: Optional[Mapping[int, Mapping]]) -> str:
+    from hearthstone import deckstrings  # type: ignore
+    from hearthstone.enums import FormatType  # type: ignore
+
+    hero = deck.hero or 0
+    if by_id is not None:
+        hero = DEFAULT_HERO_DBF_IDS.get(deck_class(deck, by_id), hero)
+    cards = sorted(Counter(deck.cards).items())
+    return deckstrings.write_deckstring(cards, [hero], FormatType.FT_WILD, sorted(deck.sideboards))
+
+
+def canonical_deckstring(deck_code: str, by_id: Optional[Mapping[int, Mapping]] = None) -> str:
+    """
+    Re-encode deck_code with cards (and sideboards) sorted and FT_WILD as the
+    format. With by_id the hero is replaced by the default hero of its class
+    (voted from the cards when the hero is unknown); otherwise the encoded
+    hero is kept.
+    """
+    return _canonical(parse_deck_code_real(deck_code), by_id)
+
+
+class DeckDeduper:
+    """
+    Streaming dedupe of deck codes by fingerprint, in first-seen order. With
+    by_id the deck class is part of the key.
+    """
+
+    def __init__(
+        self,
+        deck_parser: DeckParser = parse_deck_code_real,
+        canonical: bool = False,
+        by_id: Optional[Mapping[int, Mapping]] = None,
+    ):
+        self._parse = deck_parser
+        self._canonical = canonical
+        self._by_id = by_id
+        self._slot: dict[bytes, int] = {}
+        self._codes: list[str] = []
+        self._decks: list[ParsedDeck] = []  # parsed unique decks, kept for canonical codes
+        self._counts: list[int] = []
+        self.decks = 0
+        self.invalid_decks = 0
+
+    def add(self, deck_code: str) -> Optional[str]:
+        """Count one code; returns its fingerprint, or None when it cannot be decoded."""
+        try:
+            deck = self._parse(deck_code)
+        except DeckCodeError:
+            self.invalid_decks += 1
+            return None
+        self.decks += 1
+        klass = deck_class(deck, self._by_id) if self._by_id is not None else None
+        digest = _digest(deck.cards, deck.sideboards, klass)
+        slot = self._slot.get(digest)
+        if slot is None:
+            self._slot[digest] = len(self._codes)
+            self._codes.append(deck_code)
+            if self._canonical:
+                self._decks.append(deck)
+            self._counts.append(1)
+        else:
+            self._counts[slot] += 1
+        return digest.hex()
+
+    def add_all(self, deck_codes: Iterable[str]) -> "DeckDeduper":
+        for code in deck_codes:
+            self.add(code)
+        return self
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def report(self) -> dict:
+        """Unique decks ordered by occurrence count (ties keep first-seen order)."""
+        decks = []
+        for digest, slot in sorted(self._slot.items(), key=lambda item: (-self._counts[item[1]], item[1])):
+            code = _canonical(self._decks[slot], self._by_id) if self._canonical else self._codes[slot]
+            decks.append({"fingerprint": digest.hex(), "deckCode": code, "count": self._counts[slot]})
+        return {
+            "decks": self.decks,
+            "uniqueDecks": len(self._codes),
+            "invalidDecks": self.invalid_decks,
+            "unique": decks,
+        }
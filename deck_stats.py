@@ -0,0 +1,121 @@
+"""
+Deck statistics: mana curve, card types, spell schools, races, keyword
+tallies and total attack/health, weighted by copies.
+
+StatColumns turns a list of cards into label columns once (one pass): each
+categorical stat is a CSR-style (indptr, label ids) table, each numeric stat
+an array. Any number of decks, given as (deck, card row, copies) triples, are
+then aggregated with np.bincount into a decks x labels matrix per stat.
+
+deck_stats() is the single-deck form used by extraction ({label: copies},
+zero entries omitted except for curve buckets); columnar_stats() is the many-deck form used by batch
+output ({"labels": [...], "values": [[...] per deck]}).
+"""
+from typing import Iterable, Mapping, Sequence
+
+import numpy as np
+
+CURVE_LABELS = ["0", "1", "2", "3", "4", "5", "6", "7+"]
+NUMERIC = ("attack", "health")
+
+
+def _curve(card: Mapping) -> list[str]:
+    cost = card.get("cost")
+    return [CURVE_LABELS[min(cost, len(CURVE_LABELS) - 1)]] if isinstance(cost, int) and cost >= 0 else []
+
+
+def _one(field: str):
+    return lambda card: [card[field]] if card.get(field) else []
+
+
+def _races(card: Mapping) -> list[str]:
+    return list(card.get("races") or ([card["race"]] if card.get("race") else []))
+
+
+# Output key -> labels of one card.
+CATEGORIES = {
+    "curve": _curve,
+    "types": _one("type"),
+    "spellSchools": _one("spellSchool"),
+    "races": _races,
+    "mechanics": lambda card: list(card.get("mechanics") or ()),
+}
+
+
+class StatColumns:
+    """Per-card label columns for a fixed list of cards (rows)."""
+
+    def __init__(self, cards: Sequence[Mapping]):
+        self.labels: dict[str, list[str]] = {}
+        self.indptr: dict[str, np.ndarray] = {}
+        self.label_ids: dict[str, np.ndarray] = {}
+        for name, extract in CATEGORIES.items():
+            vocab: dict[str, int] = {label: i for i, label in enumerate(CURVE_LABELS)} if name == "curve" else {}
+            indptr, ids = [0], []
+            for card in cards:
+                ids += [vocab.setdefault(label, len(vocab)) for label in extract(card)]
+                indptr.append(len(ids))
+            self.labels[name] = list(vocab)
+            self.indptr[name] = np.asarray(indptr, dtype=np.int64)
+            self.label_ids[name] = np.asarray(ids, dtype=np.int64)
+        self.numeric = {
+            key: np.asarray([c[key] if isinstance(c.get(key), (int, float)) else 0 for c in cards], dtype=np.float64)
+            for key in NUMERIC
+        }
+
+    def aggregate(self, deck: np.ndarray, row: np.ndarray, copies: np.ndarray, n_decks: int) -> dict:
+        """Stats per deck from parallel (deck, row, copies) arrays."""
+        copies = copies.astype(np.float64)
+        out: dict = {"cards": np.bincount(deck, weights=copies, minlength=n_decks)}
+        for name in CATEGORIES:
+            indptr, ids, width = self.indptr[name], self.label_ids[name], len(self.labels[name])
+            lens = indptr[row + 1] - indptr[row]
+            total = int(lens.sum())
+            # Expand every (deck, row) pair into one entry per label of that row.
+            offsets = np.arange(total) - np.repeat(np.cumsum(lens) - lens, lens)
+            labels = ids[np.repeat(indptr[row], lens) + offsets]
+            flat = np.repeat(deck, lens) * width + labels
+            counts = np.bincount(flat, weights=np.repeat(copies, lens), minlength=n_decks * width)
+            out[name] = counts.reshape(n_decks, width)
+        for key, column in self.numeric.items():
+            out[key] = np.bincount(deck, weights=copies * column[row], minlength=n_decks)
+        return out
+
+
+def _int(value: float) -> int | float:
+    return int(value) if float(value).is_integer() else round(float(value), 4)
+
+
+def deck_stats(cards: Sequence[Mapping], copies: Iterable[int]) -> dict:
+    """Stats of one deck: cards[i] present copies[i] times."""
+    columns = StatColumns(cards)
+    weights = np.fromiter(copies, dtype=np.float64, count=len(cards))
+    agg = columns.aggregate(np.zeros(len(cards), dtype=np.int64), np.arange(len(cards)), weights, 1)
+    stats: dict = {"cards": _int(agg["cards"][0])}
+    for name in CATEGORIES:
+        stats[name] = {
+            label: _int(n)
+            for label, n in zip(columns.labels[name], agg[name][0])
+            if n or name == "curve"
+        }
+    stats["totals"] = {key: _int(agg[key][0]) for key in NUMERIC}
+    return stats
+
+
+def columnar_stats(cards: Sequence[Mapping], decks: Sequence[Sequence[Sequence[int]]]) -> dict:
+    """
+    Stats for many decks over one card table; decks[d] holds [row, copies]
+    pairs into cards (the batch_format layout). Values are per deck, in order.
+    """
+    columns = StatColumns(cards)
+    pairs = [(d, row, n) for d, deck in enumerate(decks) for row, n in deck]
+    deck, row, copies = (np.asarray(a, dtype=np.int64) for a in zip(*pairs)) if pairs else (np.empty(0, np.int64),) * 3
+    agg = columns.aggregate(deck, row, copies, len(decks))
+    stats: dict = {"cards": [_int(n) for n in agg["cards"]]}
+    for name in CATEGORIES:
+        stats[name] = {
+            "labels": columns.labels[name],
+            "values": [[_int(n) for n in per_deck] for per_deck in agg[name]],
+        }
+    stats["totals"] = {key: [_int(n) for n in agg[key]] for key in NUMERIC}
+    return stats
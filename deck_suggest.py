@@ -0,0 +1,151 @@
+"""
+Card suggestions for a partial deck.
+
+SuggestionModel precomputes per-card columns once per card pool (cost bucket,
+class membership, collectible flag, copy limit, synergy feature rows). A query
+then scores every card in one vectorized pass:
+
+    curve    how far the candidate's cost bucket is below TARGET_CURVE
+             (scaled to the deck size), normalized to the largest gap
+    synergy  SIMILARITY * provides . deck_provides + provides . deck_wants
+             + wants . deck_provides, against the deck's summed feature rows
+             (see synergy.feature_matrices), normalized to the best candidate
+    meta     inclusion rate of the card in the deck's class, from a corpus
+             (optional, see meta_stats.MetaAggregate.inclusion_rates)
+
+    score = sum(weight * component)
+
+Only legal candidates are ranked: collectible, playable in the deck's class
+(or neutral; Tourists also in the class they visit), and with copies left
+under the Legendary/other copy limit. A deck whose class cannot be determined
+(no hero, no class cards) only gets neutral candidates.
+"""
+from typing import Iterable, Mapping, Optional
+
+import numpy as np
+
+from extract_cards import ConfigError, DataError, infer_deck_class, playable_classes
+from synergy import SIMILARITY, feature_matrices
+
+DECK_SIZE = 30
+# Cards per cost bucket 0..7+ in a 30-card deck.
+TARGET_CURVE = np.asarray([1, 4, 5, 5, 5, 4, 3, 3], dtype=np.float64)
+WEIGHTS = {"curve": 1.0, "synergy": 1.0, "meta": 1.0}
+DEFAULT_TOP_K = 10
+
+
+def _unit(values: np.ndarray, legal: np.ndarray) -> np.ndarray:
+    top = values[legal].max() if legal.any() else 0.0
+    return values / top if top > 0 else np.zeros_like(values)
+
+
+class SuggestionModel:
+    """Precomputed card columns for one card pool; query with suggest()."""
+
+    def __init__(self, cards: Iterable[Mapping]):
+        cards = [c for c in cards if isinstance(c.get("dbfId"), int)]
+        if not cards:
+            raise DataError("No cards with a dbfId to suggest from.")
+        self.cards = cards
+        self.dbf_ids = np.asarray([c["dbfId"] for c in cards], dtype=np.int64)
+        self._row = {int(d): i for i, d in enumerate(self.dbf_ids)}
+        cost = np.asarray([c["cost"] if isinstance(c.get("cost"), int) else -1 for c in cards])
+        self.has_cost = cost >= 0
+        self.bucket = np.clip(cost, 0, len(TARGET_CURVE) - 1)
+        self.limit = np.asarray([1 if c.get("rarity") == "Legendary" else 2 for c in cards])
+        self.collectible = np.asarray([bool(c.get("collectible")) for c in cards])
+
+        per_card = [playable_classes(c) for c in cards]
+        self.class_names = sorted({k for ks in per_card for k in ks} | {"NEUTRAL"})
+        col = {k: i for i, k in enumerate(self.class_names)}
+        self.classes = np.zeros((len(cards), len(self.class_names)), dtype=bool)
+        for row, ks in enumerate(per_card):
+            self.classes[row, [col[k] for k in ks]] = True
+        self.provides, self.wants = feature_matrices(cards)
+
+    def _meta_column(self, rates: Optional[Mapping[int, float]]) -> np.ndarray:
+        column = np.zeros(len(self.dbf_ids))
+        if rates:
+            rows = [(self._row[d], r) for d, r in rates.items() if d in self._row]
+            if rows:
+                idx, values = zip(*rows)
+                column[list(idx)] = values
+        return column
+
+    def suggest(
+        self,
+        deck: Iterable[int],
+        k: int = DEFAULT_TOP_K,
+        *,
+        deck_class: Optional[str] = None,
+        inclusion: Optional[Mapping[int, float]] = None,
+        weights: Optional[Mapping[str, float]] = None,
+        deck_size: int = DECK_SIZE,
+    ) -> dict:
+        """
+        Top-k additions for a partial deck (one dbfId per copy). deck_class
+        (e.g. the class of the deck code's hero) defaults to the class voted
+        from the deck; inclusion maps dbfId to a corpus inclusion rate. Returns the deck summary and the suggestions
+        with their score breakdown, best first.
+        """
+        if isinstance(k, bool) or not isinstance(k, int) or k < 1:
+            raise ConfigError("'topK' must be a positive integer.")
+        if weights is not None and not isinstance(weights, Mapping):
+            raise ConfigError("'weights' must be an object of numbers.")
+        weights = {**WEIGHTS, **(weights or {})}
+        unknown = set(weights) - set(WEIGHTS)
+        if unknown:
+            raise ConfigError(f"Unknown suggestion weights: {', '.join(sorted(unknown))}.")
+        for name, weight in weights.items():
+            if isinstance(weight, bool) or not isinstance(weight, (int, float)):
+                raise ConfigError(f"'weights.{name}' must be a number.")
+        deck = list(deck)
+        rows = np.asarray([self._row[d] for d in deck if d in self._row], dtype=np.int64)
+        in_deck = np.bincount(rows, minlength=len(self.dbf_ids))
+        if deck_class is None:
+            deck_class = infer_deck_class(deck, {int(self.dbf_ids[r]): self.cards[r] for r in set(rows.tolist())})
+        elif deck_class not in self.class_names:
+            raise ConfigError(f"Unknown deck class '{deck_class}'.")
+
+        playable = self.classes[:, self.class_names.index(deck_class)] | self.classes[:, self.class_names.index("NEUTRAL")]
+        legal = self.collectible & (in_deck < self.limit) & playable
+
+        target = TARGET_CURVE * (deck_size / TARGET_CURVE.sum())
+        have = np.bincount(self.bucket[rows][self.has_cost[rows]], minlength=len(TARGET_CURVE))
+        gap = np.clip(target - have, 0, None)
+        curve = np.where(self.has_cost, gap[self.bucket], 0.0)
+
+        deck_provides = self.provides[rows].sum(axis=0)
+        deck_wants = self.wants[rows].sum(axis=0)
+        synergy = (
+            SIMILARITY * (self.provides @ deck_provides)
+            + self.provides @ deck_wants
+            + self.wants @ deck_provides
+        ).astype(np.float64)
+
+        components = {
+            "curve": _unit(curve, legal),
+            "synergy": _unit(synergy, legal),
+            "meta": self._meta_column(inclusion),
+        }
+        score = sum(weights[name] * column for name, column in components.items())
+        score = np.where(legal, score, -np.inf)
+
+        k = min(k, int(legal.sum()))
+        best = np.argpartition(-score, k - 1)[:k] if k else np.empty(0, np.int64)
+        best = best[np.lexsort((self.dbf_ids[best], -score[best]))]
+        suggestions = [
+            {
+                "dbfId": int(self.dbf_ids[i]),
+                "name": self.cards[i].get("name"),
+                "cost": self.cards[i].get("cost"),
+                "copiesLeft": int(self.limit[i] - in_deck[i]),
+                "score": round(float(score[i]), 4),
+                "breakdown": {name: round(float(column[i]), 4) for name, column in components.items()},
+            }
+            for i in best
+        ]
+        return {
+            "deck": {"class": deck_class, "size": len(deck), "missing": max(deck_size - len(deck), 0)},
+            "suggestions": suggestions,
+        }
@@ -0,0 +1,128 @@
+"""
+Deck legality checks against precomputed per-card rules.
+
+LegalityIndex is built once per card pool: for every dbfId it stores the
+card's classes, copy limit (1 for Legendary, else 2), collectible flag and set.
+Validating a deck is then one dict lookup per distinct card, so corpora of
+any size never rescan the card list.
+
+A deck's class comes from the hero in its deck code (a default hero, or a
+hero card of the pool). Only when the hero is unknown is it inferred from the
+cards as in meta_stats (most-voted non-neutral class). Cards playable in
+neither that class nor NEUTRAL are off-class; Tourist cards are also playable
+in the classes they visit (`touristFor`). Set names are compared
+case-insensitively. Every problem is reported as a structured error:
+
+    {"code": "unknownCard" | "notCollectible" | "tooManyCopies" | "offClass"
+             | "notInFormat" | "deckSize" | "decode", ...details}
+"""
+from collections import Counter
+from typing import Iterable, Iterator, Mapping, NamedTuple, Optional
+
+from extract_cards import (
+    DeckCodeError,
+    DeckParser,
+    card_classes,
+    hero_class,
+    infer_deck_class,
+    parse_deck_code_real,
+    playable_classes,
+)
+
+DECK_SIZE = 30
+
+
+class CardRule(NamedTuple):
+    classes: frozenset  # playable classes, Tourist classes included
+    limit: int
+    collectible: bool
+    card_set: Optional[str]
+
+
+class LegalityIndex:
+    """dbfId -> CardRule for one card pool, plus the optional set whitelist."""
+
+    def __init__(self, cards: Iterable[Mapping], legal_sets: Optional[Iterable[str]] = None, deck_size: int = DECK_SIZE):
+        cards = [c for c in cards if isinstance(c.get("dbfId"), int)]
+        self.rules: dict[int, CardRule] = {
+            c["dbfId"]: CardRule(
+                frozenset(playable_classes(c)),
+                1 if c.get("rarity") == "Legendary" else 2,
+                bool(c.get("collectible")),
+                c["set"].upper() if isinstance(c.get("set"), str) else None,
+            )
+            for c in cards
+        }
+        # Minimal card records for the class vote (Tourist classes do not vote).
+        self._class_cards = {c["dbfId"]: {"classes": card_classes(c)} for c in cards}
+        self.legal_sets = frozenset(s.upper() for s in legal_sets) if legal_sets else None
+        self.deck_size = deck_size
+
+    def hero_class(self, hero: Optional[int]) -> Optional[str]:
+        """Class of a hero dbfId: a default hero, or a single-class hero card of the pool."""
+        return hero_class(hero, self._class_cards)
+
+    def validate(self, dbf_ids: Iterable[int], deck_class: Optional[str] = None) -> dict:
+        """
+        Validate one decoded deck (one dbfId per copy). Without deck_class the
+        class is inferred from the cards.
+        """
+        counts = Counter(dbf_ids)
+        size = sum(counts.values())
+        deck_class = deck_class or infer_deck_class(counts.elements(), self._class_cards)
+        errors: list[dict] = []
+        if size != self.deck_size:
+            errors.append({"code": "deckSize", "size": size, "expected": self.deck_size})
+        for dbf_id in sorted(counts):
+            rule = self.rules.get(dbf_id)
+            if rule is None:
+                errors.append({"code": "unknownCard", "dbfId": dbf_id})
+                continue
+            if not rule.collectible:
+                errors.append({"code": "notCollectible", "dbfId": dbf_id})
+            if counts[dbf_id] > rule.limit:
+                errors.append({"code": "tooManyCopies", "dbfId": dbf_id, "count": counts[dbf_id], "limit": rule.limit})
+            if deck_class not in rule.classes and "NEUTRAL" not in rule.classes:
+                errors.append({"code": "offClass", "dbfId": dbf_id, "classes": sorted(rule.classes)})
+            if self.legal_sets is not None and rule.card_set not in self.legal_sets:
+                errors.append({"code": "notInFormat", "dbfId": dbf_id, "set": rule.card_set})
+        return {"class": deck_class, "size": size, "valid": not errors, "errors": errors}
+
+
+def validate_deck_codes(
+    deck_codes: Iterable[str],
+    index: LegalityIndex,
+    deck_parser: DeckParser = parse_deck_code_real,
+) -> Iterator[dict]:
+    """
+    Yield one report per code, in input order; undecodable codes get a 'decode'
+    error. Each code is parsed once; the deck class is read from its hero when
+    it is known.
+    """
+    for code in deck_codes:
+        try:
+            deck = deck_parser(code)
+        except DeckCodeError as e:
+            yield {"deckCode": code, "valid": False, "errors": [{"code": "decode", "message": str(e)}]}
+            continue
+        yield {"deckCode": code, **index.validate(deck.cards, index.hero_class(deck.hero))}
+
+
+def summarize(reports: Iterable[dict], invalid_only: bool = False) -> dict:
+    """Corpus summary with the number of decks per error code; invalid_only drops valid decks' reports."""
+    decks = valid = 0
+    error_counts: Counter = Counter()
+    kept = []
+    for report in reports:
+        decks += 1
+        valid += report["valid"]
+        error_counts.update({e["code"] for e in report["errors"]})
+        if not (invalid_only and report["valid"]):
+            kept.append(report)
+    return {
+        "decks": decks,
+        "validDecks": valid,
+        "invalidDecks": decks - valid,
+        "errorCounts": dict(sorted(error_counts.items())),
+        "results": kept,
+    }
@@ -0,0 +1,217 @@
+"""
+Exact draw probabilities (hypergeometric) for deck cards and card groups.
+
+Turn model: the player on the play starts with 3 cards, the player on the
+coin with 4, and both draw one card at the start of every turn (turn 1
+included), so by turn t a player has seen `hand + t` cards.
+
+The mulligan model is a hard mulligan for the card in question: when no copy
+is in the opening hand, the whole hand is replaced from the rest of the deck
+and then shuffled back (replacements never include the returned cards).
+
+All results come from one memoized table of binomial coefficients and are
+computed as whole (cards x turns) arrays in a single vectorized pass.
+
+Group odds (at least one card of e.g. each cost bucket) use the deck_stats
+categories as groupings.
+"""
+from functools import lru_cache
+from typing import Iterable, Mapping, Optional, Sequence
+
+import numpy as np
+
+from deck_stats import CATEGORIES
+from extract_cards import ConfigError
+
+OPENING_HAND = {"play": 3, "coin": 4}
+DEFAULT_TURNS = 10
+
+
+@lru_cache(maxsize=8)
+def binomial_table(n_max: int) -> np.ndarray:
+    """Read-only float64 table with C(n, k) at [n, k] for 0 <= k <= n <= n_max."""
+    table = np.zeros((n_max + 1, n_max + 1), dtype=np.float64)
+    table[:, 0] = 1.0
+    for n in range(1, n_max + 1):
+        table[n, 1:n + 1] = table[n - 1, :n] + table[n - 1, 1:n + 1]
+    table.setflags(write=False)
+    return table
+
+
+def _choose(table: np.ndarray, n: np.ndarray, k: np.ndarray) -> np.ndarray:
+    """Vectorized C(n, k), zero wherever k < 0, k > n or n < 0."""
+    n, k = np.broadcast_arrays(np.asarray(n), np.asarray(k))
+    valid = (n >= 0) & (k >= 0) & (k <= n)
+    upper = table.shape[0] - 1
+    return np.where(valid, table[np.clip(n, 0, upper), np.clip(k, 0, upper)], 0.0)
+
+
+def _ratio(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    """num / den with 0 where den is 0 (more cards seen than the deck holds)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, num / den, 0.0)
+
+
+def _table_for(deck_size: np.ndarray, seen: np.ndarray) -> np.ndarray:
+    return binomial_table(int(max(deck_size.max(initial=0), seen.max(initial=0))) + 1)
+
+
+def prob_at_least_one(
+    copies: Sequence[int] | np.ndarray,
+    deck_size: int | Sequence[int] | np.ndarray,
+    turns: int = DEFAULT_TURNS,
+    hand: int = OPENING_HAND["play"],
+    mulligan: bool = False,
+) -> np.ndarray:
+    """
+    P(at least one copy in hand by turn t) for every card and t = 1..turns.
+    `copies` holds each card's count; `deck_size` is shared or per card.
+    Returns an array of shape (len(copies), turns).
+    """
+    k = np.asarray(copies, dtype=np.int64)[:, None]
+    n = np.broadcast_to(np.asarray(deck_size, dtype=np.int64), k.shape[:1])[:, None]
+    t = np.arange(1, turns + 1, dtype=np.int64)[None, :]
+    table = _table_for(n, hand + t)
+    if not mulligan:
+        seen = hand + t
+        miss = _ratio(_choose(table, n - k, seen), _choose(table, n, seen))
+    else:
+        keep_miss = _ratio(_choose(table, n - k, hand), _choose(table, n, hand))
+        redraw_miss = _ratio(_choose(table, n - hand - k, hand), _choose(table, n - hand, hand))
+        draw_miss = _ratio(_choose(table, n - hand - k, t), _choose(table, n - hand, t))
+        miss = keep_miss * redraw_miss * draw_miss
+    return 1.0 - miss
+
+
+def prob_at_least_k(
+    group_size: Sequence[int] | np.ndarray,
+    at_least: Sequence[int] | np.ndarray,
+    deck_size: int,
+    turns: int = DEFAULT_TURNS,
+    hand: int = OPENING_HAND["play"],
+) -> np.ndarray:
+    """
+    P(at least k cards of a group in hand by turn t), without mulligan, for
+    every (group_size, at_least) pair and t = 1..turns. Shape (groups, turns).
+    """
+    g = np.asarray(group_size, dtype=np.int64)[:, None, None]
+    need = np.asarray(at_least, dtype=np.int64)[:, None, None]
+    seen = (hand + np.arange(1, turns + 1, dtype=np.int64))[None, :, None]
+    i = np.arange(0, int(g.max(initial=0)) + 1, dtype=np.int64)[None, None, :]
+    table = _table_for(np.asarray([deck_size]), seen)
+    ways = _choose(table, g, i) * _choose(table, deck_size - g, seen - i)
+    hits = np.where(i >= need, ways, 0.0).sum(axis=2)
+    return _ratio(hits, _choose(table, np.int64(deck_size), seen[:, :, 0]))
+
+
+def draw_odds_section(
+    copies: Sequence[int] | np.ndarray,
+    deck_size: int | Sequence[int] | np.ndarray,
+    turns: int = DEFAULT_TURNS,
+    mulligan: bool = False,
+) -> list[dict]:
+    """Per-card {'play': [...], 'coin': [...]} lists (index 0 is turn 1), rounded to 4 places."""
+    play = prob_at_least_one(copies, deck_size, turns, OPENING_HAND["play"], mulligan).round(4)
+    coin = prob_at_least_one(copies, deck_size, turns, OPENING_HAND["coin"], mulligan).round(4)
+    return [{"play": p.tolist(), "coin": c.tolist()} for p, c in zip(play, coin)]
+
+
+def annotate_draw_odds(
+    entries: list[dict],
+    deck_size: Optional[int] = None,
+    turns: int = DEFAULT_TURNS,
+    mulligan: bool = False,
+) -> None:
+    """
+    Add a 'drawOdds' section to every entry that carries countFromDeck.
+    deck_size defaults to the sum of countFromDeck over the entries.
+    """
+    counted = [e for e in entries if isinstance(e.get("countFromDeck"), int)]
+    if not counted:
+        return
+    copies = [e["countFromDeck"] for e in counted]
+    size = deck_size if deck_size is not None else sum(copies)
+    for entry, odds in zip(counted, draw_odds_section(copies, size, turns, mulligan)):
+        entry["drawOdds"] = odds
+
+
+def annotate_batch_draw_odds(doc: dict, turns: int = DEFAULT_TURNS, mulligan: bool = False) -> None:
+    """
+    Add per-deck 'drawOdds' to a batch document (see batch_format): one
+    {'play', 'coin'} pair per deck row, all decks computed in one pass.
+    Deck size is the deck's decoded 'deckSize' (cards missing from the table
+    still take up draws), else the sum of its counts.
+    """
+    decks = [d for d in doc["decks"] if d["cards"]]
+    copies = np.asarray([count for d in decks for _row, count in d["cards"]], dtype=np.int64)
+    if not copies.size:
+        return
+    lengths = [len(d["cards"]) for d in decks]
+    sizes = np.repeat([_deck_size(d) for d in decks], lengths)
+    sections = iter(draw_odds_section(copies, sizes, turns, mulligan))
+    for deck, length in zip(decks, lengths):
+        deck["drawOdds"] = [next(sections) for _ in range(length)]
+
+
+def annotate_batch_group_odds(doc: dict, cards: Sequence[Mapping], by: str, turns: int = DEFAULT_TURNS) -> None:
+    """
+    Add per-deck 'drawOddsGroups' to a batch document; cards are the full
+    records behind the document's card table rows.
+    """
+    for deck in doc["decks"]:
+        if deck["cards"]:
+            groups = card_groups([cards[row] for row, _n in deck["cards"]], [n for _row, n in deck["cards"]], by)
+            deck["drawOddsGroups"] = group_draw_odds(groups, _deck_size(deck), turns)
+
+
+def _deck_size(deck: Mapping) -> int:
+    return deck.get("deckSize") or sum(n for _row, n in deck["cards"])
+
+
+def parse_draw_odds_option(option: bool | Mapping | None) -> Optional[dict]:
+    """Normalize the config 'drawOdds' value (true or {turns, mulligan, groups}) or None when off."""
+    if not option:
+        return None
+    if option is True:
+        return {"turns": DEFAULT_TURNS, "mulligan": False, "groups": None}
+    if not isinstance(option, Mapping):
+        raise ConfigError("'drawOdds' must be true or an object with 'turns'/'mulligan'/'groups'.")
+    turns = option.get("turns", DEFAULT_TURNS)
+    if not isinstance(turns, int) or turns < 1:
+        raise ConfigError("'drawOdds.turns' must be a positive integer.")
+    groups = option.get("groups")
+    if groups is not None and groups not in CATEGORIES:
+        raise ConfigError(f"'drawOdds.groups' must be one of: {', '.join(CATEGORIES)}.")
+    mulligan = option.get("mulligan", False)
+    if not isinstance(mulligan, bool):
+        raise ConfigError("'drawOdds.mulligan' must be true or false.")
+    return {"turns": turns, "mulligan": mulligan, "groups": groups}
+
+
+def card_groups(cards: Sequence[Mapping], copies: Iterable[int], by: str) -> dict[str, list[int]]:
+    """Copy counts per label of a deck_stats category (e.g. 'curve'), labels sorted."""
+    groups: dict[str, list[int]] = {}
+    for card, n in zip(cards, copies):
+        for label in CATEGORIES[by](card):
+            groups.setdefault(label, []).append(n)
+    return dict(sorted(groups.items()))
+
+
+def group_draw_odds(
+    groups: Mapping[str, Iterable[int]],
+    deck_size: int,
+    turns: int = DEFAULT_TURNS,
+    at_least: int = 1,
+) -> dict[str, dict]:
+    """
+    Odds of holding at least `at_least` cards from each named group (given as
+    the copy counts of its cards, e.g. all 1-drops) by each turn.
+    """
+    names = list(groups)
+    if not names:
+        return {}
+    sizes = [sum(groups[name]) for name in names]
+    need = [at_least] * len(names)
+    play = prob_at_least_k(sizes, need, deck_size, turns, OPENING_HAND["play"]).round(4)
+    coin = prob_at_least_k(sizes, need, deck_size, turns, OPENING_HAND["coin"]).round(4)
+    return {name: {"play": p.tolist(), "coin": c.tolist()} for name, p, c in zip(names, play, coin)}
@@ -1,9 +1,7 @@
-import argparse
 import json
 import sys
-from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional
 from collections import Counter
 
 
@@ -33,14 +31,6 @@ def _eprint(msg: str) -> None:
     print(msg, file=_sys.stderr, flush=True)
 
 
-@dataclass(frozen=True)
-class Config:
-    source_file: Path
-    ids: list[int]
-    basic: bool = False
-    output_file: Path | None = None
-
-
 def load_config(path: str | Path) -> dict:
     p = Path(path)
     try:
@@ -49,10 +39,73 @@ def load_config(path: str | Path) -> dict:
         raise ConfigError(f"Error loading config: {e}") from e
 
 
-def load_cards(source_file: str | Path) -> list[dict]:
+# -- Precompiled card index ---------------------------------------------------
+# A marshal dump of the card list with a header naming the interpreter that
+# wrote it (marshal is version-specific). Loading one skips JSON parsing entirely.
+# Only load index files you built yourself: marshal is not safe for untrusted input.
+INDEX_SUFFIX = ".hsidx"
+_INDEX_MAGIC = b"HSIDX1"
+
+# sourceFile suffixes served by the SQLite card store (see card_store.py).
+CARD_STORE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+
+
+def is_card_store(path: str | Path) -> bool:
+    """True when path names a SQLite card store (by suffix)."""
+    return Path(path).suffix.lower() in CARD_STORE_SUFFIXES
+
+# Card sources embedded in a zipapp, keyed by the source file's base name.
+_EMBEDDED_SOURCES: Dict[str, Callable[[], bytes]] = {}
+
+
+def dump_card_index(cards: list[dict]) -> bytes:
+    import marshal
+
+    return _INDEX_MAGIC + bytes(sys.version_info[:2]) + marshal.dumps(cards)
+
+
+def parse_card_index(blob: bytes) -> list[dict]:
+    import marshal
+
+    header = _INDEX_MAGIC + bytes(sys.version_info[:2])
+    if not blob.startswith(header):
+        raise DataError("Card index was built by a different tool or Python version; rebuild it.")
+    return marshal.loads(memoryview(blob)[len(header):])
+
+
+def register_embedded_source(name: str, read_blob: Callable[[], bytes]) -> None:
+    """
+    Serve load_cards() requests for any source whose base name is `name` from an
+    embedded precompiled index (used by the zipapp built with build_zipapp.py).
+    """
+    _EMBEDDED_SOURCES[name] = read_blob
+
+
+def _read_source(p: Path) -> Any:
+    embedded = _EMBEDDED_SOURCES.get(p.name)
+    if embedded is not None:
+        return parse_card_index(embedded())
+    if p.suffix == INDEX_SUFFIX:
+        return parse_card_index(p.read_bytes())
+    if is_card_store(p):
+        from card_store import CardStore
+
+        with CardStore.open(p) as store:
+            return store.all_cards()
+    return json.loads(p.read_text(encoding="utf-8"))
+
+
+def load_cards(source_file: str | Path, compact: bool = False) -> list[dict]:
+    """
+    Load the card list from a JSON dump or a precompiled index.
+    With compact=True, records become read-only CompactCards (see compact_cards),
+    which cut resident memory for long-lived processes.
+    """
     p = Path(source_file)
     try:
-        data = json.loads(p.read_text(encoding="utf-8"))
+        data = _read_source(p)
+    except (DataError, IOErrorEx):
+        raise
     except Exception as e:
         raise IOErrorEx(f"Error loading source file: {e}") from e
     if not isinstance(data, list):
@@ -60,28 +113,101 @@ def load_cards(source_file: str | Path) -> list[dict]:
     # Status/progress to STDERR to keep STDOUT clean for JSON redirection
     _eprint(f"Loaded {len(data)} cards from source")
 
+    if compact:
+        from compact_cards import compact_cards
+
+        data = compact_cards(data)
     return data
 
 
+def build_card_index(cards: Iterable[dict]) -> dict[int, dict]:
+    """
+    Map dbfId -> card. Later duplicates win, matching filter_cards_by_id.
+    """
+    return {c.get("dbfId"): c for c in cards}
+
+
 def filter_cards_by_id(cards: Iterable[dict], ids_to_extract: list[int]) -> list[dict]:
     """
     Return cards in the same order as ids_to_extract for determinism.
     """
-    by_id = {c.get("dbfId"): c for c in cards}
+    by_id = build_card_index(cards)
     return [by_id[i] for i in ids_to_extract if i in by_id]
 
 
+def as_plain_dict(card: Mapping) -> dict:
+    """Fresh plain dict for a card record (dict or CompactCard)."""
+    to_dict = getattr(card, "to_dict", None)
+    return to_dict() if to_dict is not None else dict(card)
+
+
 def to_basic_fields(card: dict) -> dict:
     # Include dbfId for traceability.
     keys = ("name", "cost", "attack", "health", "text", "dbfId")
     return {k: card.get(k) for k in keys if k in card}
 
 
-def write_output(path: str | Path, data: Any) -> None:
+def _dumps(data: Any, compact: bool = False) -> str:
+    if compact:
+        return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def card_classes(card: Mapping) -> list[str]:
+    """Classes a card can be played in: 'classes', else 'cardClass', else NEUTRAL."""
+    classes = card.get("classes")
+    if classes:
+        return list(classes)
+    return [card.get("cardClass") or "NEUTRAL"]
+
+
+def playable_classes(card: Mapping) -> list[str]:
+    """card_classes plus the classes a Tourist card visits ('touristFor')."""
+    classes = card_classes(card)
+    return classes + [k for k in card.get("touristFor") or () if k not in classes]
+
+
+# Default (non-skin) hero per class.
+DEFAULT_HERO_DBF_IDS = {
+    "DEATHKNIGHT": 78065, "DEMONHUNTER": 56550, "DRUID": 274, "HUNTER": 31, "MAGE": 637,
+    "PALADIN": 671, "PRIEST": 813, "ROGUE": 930, "SHAMAN": 1066, "WARLOCK": 893, "WARRIOR": 7,
+}
+_HERO_CLASSES = {hero: klass for klass, hero in DEFAULT_HERO_DBF_IDS.items()}
+
+
+def hero_class(hero: Optional[int], by_id: Optional[Mapping[int, Mapping]] = None) -> Optional[str]:
+    """
+    Class of an encoded hero: a default hero, or a hero card of by_id with a
+    single non-neutral class (skins). None when the hero is unknown.
+    """
+    if hero in _HERO_CLASSES:
+        return _HERO_CLASSES[hero]
+    card = by_id.get(hero) if by_id is not None and hero is not None else None
+    if card is not None:
+        classes = [k for k in card_classes(card) if k != "NEUTRAL"]
+        if len(classes) == 1:
+            return classes[0]
+    return None
+
+
+def infer_deck_class(dbf_ids: Iterable[int], by_id: Mapping[int, Mapping]) -> str:
+    """
+    Deck class by vote: each copy votes for its card's non-neutral classes and
+    the most-voted class wins (ties by name); NEUTRAL when no card votes.
+    """
+    votes: Counter = Counter()
+    for dbf_id in dbf_ids:
+        card = by_id.get(dbf_id)
+        if card is not None:
+            votes.update(k for k in card_classes(card) if k != "NEUTRAL")
+    return max(sorted(votes), key=votes.__getitem__) if votes else "NEUTRAL"
+
+
+def write_output(path: str | Path, data: Any, compact: bool = False) -> None:
     out = Path(path)
     try:
         out.parent.mkdir(parents=True, exist_ok=True)
-        out.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        out.write_text(_dumps(data, compact), encoding="utf-8")
     except Exception as e:
         raise IOErrorEx(f"Error writing output file: {e}") from e
 
@@ -89,43 +215,106 @@ def write_output(path: str | Path, data: Any) -> None:
 DeckDecoder = Callable[[str], list[int]]
 
 
+MODES = ("extract", "batch", "meta", "dedupe", "validate", "suggest")
+
+
 def validate_config(cfg: dict) -> None:
     """
-    Ensure required fields are present and at least one of deckCode/ids is provided.
+    Ensure required fields are present and the inputs match the selected mode:
+    deckCode/ids for 'extract' and 'suggest', deckCodes/deckCodesFile for the corpus modes.
     """
     if "sourceFile" not in cfg:
         raise ConfigError("missing required field 'sourceFile'.")
-    if not cfg.get("deckCode") and not cfg.get("ids"):
-        raise ConfigError("provide 'deckCode' or 'ids'.")
+    mode = cfg.get("mode", "extract")
+    if mode not in MODES:
+        raise ConfigError(f"'mode' must be one of: {', '.join(MODES)}.")
+    if mode in ("extract", "suggest"):
+        if not cfg.get("deckCode") and not cfg.get("ids"):
+            raise ConfigError("provide 'deckCode' or 'ids'.")
+    elif not cfg.get("deckCodes") and not cfg.get("deckCodesFile"):
+        raise ConfigError(f"mode '{mode}' requires 'deckCodes' or 'deckCodesFile'.")
+
+
+class ParsedDeck(NamedTuple):
+    """A decoded deck code."""
+    cards: list[int]  # one dbfId per copy
+    hero: Optional[int]  # encoded hero dbfId, None when the code has none
+    sideboards: list[tuple[int, int, int]]  # (dbfId, count, owner dbfId)
+
+
+DeckParser = Callable[[str], ParsedDeck]
+
+
+def _read_varints(data: bytes) -> Iterator[int]:
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            yield value
+            value = shift = 0
+    if shift:
+        raise ValueError("Truncated varint")
+
+
+def parse_deck_code_real(deck_code: str) -> ParsedDeck:
+    """
+    Parse a Hearthstone deck code into its cards (one entry per copy, e.g. a
+    2x card appears twice), hero and sideboards.
+
+    Reads the deckstring format (base64 of varints: version, format, heroes,
+    1x/2x/nx card lists, optional sideboards) directly, as
+    hearthstone.deckstrings does, without importing that package: its enums
+    alone take longer to import than the rest of a short run.
+    """
+    import base64
+    import binascii
+
+    try:
+        raw = base64.b64decode(deck_code)
+        if raw[:1] != b"\0":
+            raise ValueError("Invalid deckstring")
+        values = _read_varints(raw[1:])
+        version, _format = next(values), next(values)
+        if version != 1:
+            raise ValueError(f"Unsupported deckstring version {version}")
+        heroes = [next(values) for _ in range(next(values))]
+        pairs: list[tuple[int, int]] = []
+        for copies in (1, 2, None):
+            for _ in range(next(values)):
+                dbf = next(values)
+                pairs.append((dbf, copies or next(values)))
+        cards = [dbf for dbf, n in sorted(pairs) for _ in range(n)]
+        sideboards: list[tuple[int, int, int]] = []
+        # The sideboard section starts with a 0/1 flag byte, which reads as a varint.
+        if next(values, 0) == 1:
+            for copies in (1, 2, None):
+                for _ in range(next(values)):
+                    dbf = next(values)
+                    count = copies or next(values)
+                    sideboards.append((dbf, count, next(values)))
+        return ParsedDeck(cards, min(heroes) if heroes else None, sorted(sideboards, key=lambda sb: (sb[2], sb[0])))
+    except (TypeError, ValueError, StopIteration, binascii.Error) as e:
+        raise DeckCodeError("Deck code decode failed. Ensure it's a valid Hearthstone deck code.") from e
 
 
 def decode_deck_code_real(deck_code: str) -> list[int]:
     """
-    Decode a Hearthstone deck code into a list of dbfIds using hearthstone.deckstrings.
+    Decode a Hearthstone deck code into a list of dbfIds (see parse_deck_code_real).
     The returned list contains one entry per copy (e.g., a 2x card appears twice).
     """
-    try:
-        from hearthstone import deckstrings  # type: ignore
-        deck = deckstrings.Deck.from_deckstring(deck_code)
-        result: list[int] = []
-        for dbf, count in deck.cards:
-            try:
-                c = int(count)
-            except (TypeError, ValueError):
-                c = 1
-            result.extend([dbf] * c)
-        return result
-    except Exception as e:
-        raise DeckCodeError(
-            "Deck code decode failed. Ensure it's valid or install 'hearthstone' (pip install hearthstone)."
-        ) from e
+    return parse_deck_code_real(deck_code).cards
 
 
 # -- Deck decoder indirection -------------------------------------------------
-# Default decoder uses the real hearthstone library.
+# Default decoder reads deckstrings natively (no hearthstone import).
 # Tests may monkeypatch this symbol to a fake callable with signature (str) -> list[int].
 DECK_DECODER: DeckDecoder
 DECK_DECODER = lambda s: decode_deck_code_real(s)
+# Modes that also need the hero or sideboards (dedupe, validate, meta, suggest)
+# parse through this seam instead; fakes return a ParsedDeck.
+DECK_PARSER: DeckParser
+DECK_PARSER = lambda s: parse_deck_code_real(s)
 
 # -- Multiplicity extension seam (test-agnostic) ------------------------------
 # Tests may monkeypatch this symbol to a callable:
@@ -134,6 +323,37 @@ DECK_DECODER = lambda s: decode_deck_code_real(s)
 MultiplicityResolver = Callable[[List[dict], str], Dict[str, int]]
 
 
+def make_multiplicity_resolver(deck_decoder: DeckDecoder) -> MultiplicityResolver:
+    """
+    Build the default resolver around an explicit decoder (no module globals),
+    so library callers can inject their own decoder per call.
+    """
+
+    def resolve(items: List[dict], deck_code: str) -> Dict[str, int]:
+        if not deck_code:
+            return {}
+        try:
+            dbf_ids = deck_decoder(deck_code)
+        except DeckCodeError:
+            return {}
+        id_counts = Counter(dbf_ids)
+        # Build present id->name mapping from items
+        id_to_name: Dict[int, str] = {}
+        for e in items:
+            n = e.get("name")
+            i = e.get("dbfId")
+            if isinstance(n, str) and isinstance(i, int):
+                id_to_name[i] = n
+        name_counts: Dict[str, int] = {}
+        for dbf_id, cnt in id_counts.items():
+            name = id_to_name.get(dbf_id)
+            if name:
+                name_counts[name] = int(cnt)
+        return name_counts
+
+    return resolve
+
+
 def _default_multiplicity_resolver(items: List[dict], deck_code: str) -> Dict[str, int]:
     """
     Production SPIKE implementation:
@@ -141,51 +361,42 @@ def _default_multiplicity_resolver(items: List[dict], deck_code: str) -> Dict[st
     - Build a dbfId->name mapping from the current output items (supports basic/non-basic).
     - Convert counts to {name: count} for names present in items.
     """
-    if not deck_code:
-        return {}
-    try:
-        dbf_ids = DECK_DECODER(deck_code)
-    except DeckCodeError:
-        return {}
-    id_counts = Counter(dbf_ids)
-    # Build present id->name mapping from items
-    id_to_name: Dict[int, str] = {}
-    for e in items:
-        n = e.get("name")
-        i = e.get("dbfId")
-        if isinstance(n, str) and isinstance(i, int):
-            id_to_name[i] = n
-    name_counts: Dict[str, int] = {}
-    for dbf_id, cnt in id_counts.items():
-        name = id_to_name.get(dbf_id)
-        if name:
-            name_counts[name] = int(cnt)
-    return name_counts
+    return make_multiplicity_resolver(DECK_DECODER)(items, deck_code)
 
 
 # By default, do nothing. Tests can monkeypatch this to return counts.
 MULTIPLICITY_RESOLVER: MultiplicityResolver = _default_multiplicity_resolver
 
 
-def _apply_multiplicity_by_name(card_items: List[dict], deck_code: Optional[str]) -> None:
+def _annotate_count(entry: dict, count: int) -> None:
+    entry["countFromDeck"] = count
+    name = entry.get("name")
+    if isinstance(name, str):
+        entry["displayName"] = f"{name} ×{count}"
+
+
+def _apply_multiplicity_by_name(
+    card_items: List[dict],
+    deck_code: Optional[str],
+    resolver: Optional[MultiplicityResolver] = None,
+) -> None:
     """
     Add multiplicity fields only when a deck_code is provided AND the resolver returns counts.
+    The resolver defaults to the MULTIPLICITY_RESOLVER hook.
     Keeps 'name' faithful to source. Adds:
       * countFromDeck (int)
       * displayName   (str) -> "<name> ×<countFromDeck>"
     """
     if not deck_code:
         return
-    counts = MULTIPLICITY_RESOLVER(card_items, deck_code)
+    counts = (resolver or MULTIPLICITY_RESOLVER)(card_items, deck_code)
     if not isinstance(counts, dict) or not counts:
         return
     for entry in card_items:
         name = entry.get("name")
         if not isinstance(name, str) or name not in counts:
             continue
-        count = int(counts[name])
-        entry["countFromDeck"] = count
-        entry["displayName"] = f"{name} ×{count}"
+        _annotate_count(entry, int(counts[name]))
 
 
 def resolve_ids_from_config(cfg: dict, deck_decoder: DeckDecoder) -> list[int]:
@@ -210,39 +421,293 @@ def resolve_ids_from_config(cfg: dict, deck_decoder: DeckDecoder) -> list[int]:
     return sorted(ids)
 
 
-def main(argv: list[str] | None = None) -> int:
+def extract_entries(
+    by_id: Mapping[int, dict],
+    ids: list[int],
+    deck_code: Optional[str] = None,
+    basic: bool = False,
+    resolver: Optional[MultiplicityResolver] = None,
+) -> list[dict]:
+    """
+    Select ids from a card index, project them, and annotate multiplicity.
+    Entries are fresh dicts, so the index itself is never mutated.
+    """
+    selected = [by_id[i] for i in ids if i in by_id]
+    entries = [to_basic_fields(c) if basic else as_plain_dict(c) for c in selected]
+    _apply_multiplicity_by_name(entries, deck_code, resolver)
+    return entries
+
+
+def iter_deck_codes(cfg: dict) -> Iterator[str]:
+    """
+    Yield deck codes from 'deckCodes' (array) and then 'deckCodesFile'
+    (one code per line; blank lines and '#' comments are skipped).
+    The file is streamed, so corpora of any size stay out of memory.
+    """
+    codes = cfg.get("deckCodes") or []
+    if not isinstance(codes, list) or not all(isinstance(c, str) for c in codes):
+        raise ConfigError("'deckCodes' must be an array of strings.")
+    yield from codes
+    path = cfg.get("deckCodesFile")
+    if not path:
+        return
+    try:
+        with Path(path).open(encoding="utf-8") as fh:
+            for line in fh:
+                code = line.strip()
+                if code and not code.startswith("#"):
+                    yield code
+    except OSError as e:
+        raise IOErrorEx(f"Error reading deck codes file: {e}") from e
+
+
+def _emit(data: Any, output_file: str | None, compact: bool = False) -> None:
+    if output_file:
+        write_output(output_file, data, compact)
+        _eprint(f"Output written to {output_file}")
+    else:
+        # Emit JSON ONLY to STDOUT (supports shell redirection cleanly)
+        sys.stdout.write(_dumps(data, compact))
+        sys.stdout.flush()
+
+
+def _card_index(raw_cfg: dict, cards: Iterable[dict]) -> Mapping[int, dict]:
+    """dbfId index for a run, localized when the config sets 'locale'."""
+    return _localize(build_card_index(cards), raw_cfg)
+
+
+def _localize(by_id: Mapping[int, dict], raw_cfg: dict) -> Mapping[int, dict]:
+    if not raw_cfg.get("locale"):
+        return by_id
+    from locales import localize_index
+
+    return localize_index(by_id, raw_cfg, raw_cfg["sourceFile"])
+
+
+def _decode_once(deck_decoder: DeckDecoder) -> DeckDecoder:
+    """Wrap deck_decoder so a run decodes each code at most once (failures included)."""
+    cache: Dict[str, Any] = {}
+
+    def decode(deck_code: str) -> list[int]:
+        if deck_code not in cache:
+            try:
+                cache[deck_code] = deck_decoder(deck_code)
+            except DeckCodeError as e:
+                cache[deck_code] = e
+        result = cache[deck_code]
+        if isinstance(result, DeckCodeError):
+            raise result
+        return result
+
+    return decode
+
+
+def _apply_draw_odds(
+    entries: list[dict], by_id: Mapping[int, dict], ids: list[int], raw_cfg: dict, deck_decoder: DeckDecoder
+) -> Optional[dict]:
+    """
+    Optional 'drawOdds' section for deckCode extractions. Returns the group
+    odds when 'drawOdds.groups' is set; groups hold only cards from the deck.
+    """
+    deck_code = raw_cfg.get("deckCode")
+    if not raw_cfg.get("drawOdds") or not deck_code:
+        return None
+    from draw_odds import annotate_draw_odds, card_groups, group_draw_odds, parse_draw_odds_option
+
+    opts = parse_draw_odds_option(raw_cfg["drawOdds"])
+    try:
+        deck_size = len(deck_decoder(deck_code))
+    except DeckCodeError:
+        return None
+    annotate_draw_odds(entries, deck_size, opts["turns"], opts["mulligan"])
+    if not opts["groups"]:
+        return None
+    # entries follow the order of the selected cards; extra 'ids' carry no count and are not drawn.
+    selected = [by_id[i] for i in ids if i in by_id]
+    counted = [(card, e["countFromDeck"]) for card, e in zip(selected, entries) if isinstance(e.get("countFromDeck"), int)]
+    groups = card_groups([card for card, _n in counted], [n for _card, n in counted], opts["groups"])
+    return group_draw_odds(groups, deck_size, opts["turns"])
+
+
+def _with_stats(
+    entries: list[dict], by_id: Mapping[int, dict], ids: list[int], raw_cfg: dict, group_odds: Optional[dict] = None
+) -> Any:
+    """Wrap extraction output as {"cards", "stats", "drawOddsGroups"} when either section is requested."""
+    if not raw_cfg.get("stats") and group_odds is None:
+        return entries
+    out: dict = {"cards": entries}
+    if raw_cfg.get("stats"):
+        from deck_stats import deck_stats
+
+        # entries follow the order of the selected cards; copies default to 1 for ids-only input.
+        selected = [by_id[i] for i in ids if i in by_id]
+        out["stats"] = deck_stats(selected, (e.get("countFromDeck", 1) for e in entries))
+    if group_odds is not None:
+        out["drawOddsGroups"] = group_odds
+    return out
+
+
+def _run_batch(raw_cfg: dict, cards: list[dict]) -> Any:
+    from batch_format import encode_batch
+
+    project = to_basic_fields if raw_cfg.get("basic") else None
+    by_id = _card_index(raw_cfg, cards)
+    doc = encode_batch(iter_deck_codes(raw_cfg), by_id, DECK_DECODER, project)
+    table = [by_id[c["dbfId"]] for c in doc["cards"]]
+    if raw_cfg.get("drawOdds"):
+        from draw_odds import annotate_batch_draw_odds, annotate_batch_group_odds, parse_draw_odds_option
+
+        opts = parse_draw_odds_option(raw_cfg["drawOdds"])
+        annotate_batch_draw_odds(doc, opts["turns"], opts["mulligan"])
+        if opts["groups"]:
+            annotate_batch_group_odds(doc, table, opts["groups"], opts["turns"])
+    if raw_cfg.get("stats"):
+        from deck_stats import columnar_stats
+
+        doc["stats"] = columnar_stats(table, [d["cards"] for d in doc["decks"]])
+    _eprint(f"Encoded {len(doc['decks'])} decks over {len(doc['cards'])} unique cards")
+    return doc
+
+
+def _parse_config_arg(argv: list[str] | None) -> str:
+    """
+    Return the --config path. The plain '--config PATH' form is handled inline;
+    argparse (and its help/usage machinery) is imported only for anything else.
+    """
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) == 2 and args[0] == "--config" and not args[1].startswith("-"):
+        return args[1]
+    if len(args) == 1 and args[0].startswith("--config=") and len(args[0]) > len("--config="):
+        return args[0][len("--config="):]
+
+    import argparse
+
     parser = argparse.ArgumentParser()
     parser.add_argument('--config', help='Path to JSON config file')
-    args = parser.parse_args(argv)
+    parsed = parser.parse_args(argv)
 
-    if not args.config:
+    if not parsed.config:
         parser.error("Missing required argument: --config")
+    return parsed.config
+
+
+def _run_store_extract(raw_cfg: dict, source_file: str) -> Any:
+    """Extract mode against a SQLite card store: only the requested cards are read."""
+    from card_store import CardStore
+
+    with CardStore.open(source_file) as store:
+        _eprint(f"Loaded card store with {len(store)} cards from source")
+        decoder = _decode_once(DECK_DECODER)
+        ids_to_extract = resolve_ids_from_config(raw_cfg, decoder)
+        by_id = _localize(store.subset(ids_to_extract), raw_cfg)
+    entries = extract_entries(by_id, ids_to_extract, raw_cfg.get("deckCode"), bool(raw_cfg.get("basic")))
+    group_odds = _apply_draw_odds(entries, by_id, ids_to_extract, raw_cfg, decoder)
+    return _with_stats(entries, by_id, ids_to_extract, raw_cfg, group_odds)
+
+
+def _run_meta(raw_cfg: dict, cards: list[dict]) -> Any:
+    from meta_stats import aggregate_deck_codes
+
+    workers = raw_cfg.get("workers", 1)
+    if workers is not None and (isinstance(workers, bool) or not isinstance(workers, int) or workers < 1):
+        raise ConfigError("'workers' must be a positive integer or null.")
+    parser = DECK_PARSER if workers == 1 else parse_deck_code_real
+    agg = aggregate_deck_codes(iter_deck_codes(raw_cfg), cards, parser, workers)
+    _eprint(f"Aggregated {agg.decks} decks ({agg.invalid_decks} invalid)")
+    return agg.report(_card_index(raw_cfg, cards))
+
+
+def _run_validate(raw_cfg: dict, cards: list[dict]) -> Any:
+    from deck_validation import DECK_SIZE, LegalityIndex, summarize, validate_deck_codes
+
+    index = LegalityIndex(cards, raw_cfg.get("legalSets"), raw_cfg.get("deckSize", DECK_SIZE))
+    summary = summarize(validate_deck_codes(iter_deck_codes(raw_cfg), index, DECK_PARSER), bool(raw_cfg.get("invalidOnly")))
+    _eprint(f"Validated {summary['decks']} decks ({summary['invalidDecks']} invalid)")
+    return summary
+
+
+def _run_suggest(raw_cfg: dict, cards: list[dict]) -> Any:
+    from deck_suggest import DEFAULT_TOP_K, SuggestionModel
+
+    opts = raw_cfg.get("suggest") or {}
+    parsed = DECK_PARSER(raw_cfg["deckCode"]) if raw_cfg.get("deckCode") else ParsedDeck([], None, [])
+    deck = list(parsed.cards)
+    try:
+        deck += [int(x) for x in raw_cfg.get("ids") or []]
+    except (TypeError, ValueError) as e:
+        raise ConfigError("'ids' must be an array of integers.") from e
+    by_id = build_card_index(cards)
+    # One class for legality and the meta lookup: configured, else the hero's, else the card vote.
+    deck_class = opts.get("deckClass") or hero_class(parsed.hero, by_id) or infer_deck_class(deck, by_id)
+    model = SuggestionModel(cards)
+    inclusion = None
+    if raw_cfg.get("deckCodes") or raw_cfg.get("deckCodesFile"):
+        from meta_stats import aggregate_deck_codes
+
+        agg = aggregate_deck_codes(iter_deck_codes(raw_cfg), cards, DECK_PARSER)
+        inclusion = agg.inclusion_rates(deck_class)
+    return model.suggest(
+        deck,
+        opts.get("topK", DEFAULT_TOP_K),
+        deck_class=deck_class,
+        inclusion=inclusion,
+        weights=opts.get("weights"),
+    )
+
+
+def _run_dedupe(raw_cfg: dict, source_file: str) -> Any:
+    from deck_fingerprint import DeckDeduper
+
+    canonical = bool(raw_cfg.get("canonical"))
+    # Cards resolve each deck's class (hero skins, card vote) for the key and the canonical hero.
+    by_id = build_card_index(load_cards(source_file))
+    deduper = DeckDeduper(DECK_PARSER, canonical, by_id).add_all(iter_deck_codes(raw_cfg))
+    _eprint(f"Deduplicated {deduper.decks} decks into {len(deduper)} unique ({deduper.invalid_decks} invalid)")
+    return deduper.report()
+
+
+def main(argv: list[str] | None = None) -> int:
+    config_path = _parse_config_arg(argv)
 
     try:
-        raw_cfg = load_config(args.config)
+        raw_cfg = load_config(config_path)
         validate_config(raw_cfg)
         source_file = raw_cfg["sourceFile"]
         basic = bool(raw_cfg.get("basic"))
         output_file = raw_cfg.get("outputFile")
 
+        mode = raw_cfg.get("mode", "extract")
+        if mode == "extract" and is_card_store(source_file):
+            _emit(_run_store_extract(raw_cfg, source_file), output_file)
+            return 0
+        if mode == "dedupe":
+            _emit(_run_dedupe(raw_cfg, source_file), output_file)
+            return 0
+
         cards = load_cards(source_file)
-        # Resolve final id set from deckCode and/or ids
-        ids_to_extract = resolve_ids_from_config(raw_cfg, DECK_DECODER)
-        filtered = filter_cards_by_id(cards, ids_to_extract)
-        if basic:
-            filtered = [to_basic_fields(c) for c in filtered]
+        if mode == "batch":
+            _emit(_run_batch(raw_cfg, cards), output_file, compact=True)
+            return 0
+        if mode == "meta":
+            _emit(_run_meta(raw_cfg, cards), output_file)
+            return 0
+        if mode == "validate":
+            _emit(_run_validate(raw_cfg, cards), output_file)
+            return 0
+        if mode == "suggest":
+            _emit(_run_suggest(raw_cfg, cards), output_file)
+            return 0
 
-        # Conditionally augment with multiplicity via resolver hook (test-agnostic).
+        # Resolve final id set from deckCode and/or ids
+        decoder = _decode_once(DECK_DECODER)
+        ids_to_extract = resolve_ids_from_config(raw_cfg, decoder)
+        # Multiplicity comes from the MULTIPLICITY_RESOLVER hook (test-agnostic).
         # Note: No broad exception catching here; resolver errors will surface in tests.
-        _apply_multiplicity_by_name(filtered, raw_cfg.get("deckCode"))
-
-        if output_file:
-            write_output(output_file, filtered)
-            _eprint(f"Output written to {output_file}")
-        else:
-            # Emit JSON ONLY to STDOUT (supports shell redirection cleanly)
-            sys.stdout.write(json.dumps(filtered, ensure_ascii=False, indent=2))
-            sys.stdout.flush()
+        by_id = _card_index(raw_cfg, cards)
+        filtered = extract_entries(by_id, ids_to_extract, raw_cfg.get("deckCode"), basic)
+        group_odds = _apply_draw_odds(filtered, by_id, ids_to_extract, raw_cfg, decoder)
+
+        _emit(_with_stats(filtered, by_id, ids_to_extract, raw_cfg, group_odds), output_file)
         return 0
     except (ConfigError, DeckCodeError, DataError, IOErrorEx) as e:
         print(str(e), file=sys.stderr)
@@ -253,4 +718,6 @@ def main(argv: list[str] | None = None) -> int:
 
 
 if __name__ == "__main__":
+    # Sibling modules import 'extract_cards'; share this module instead of loading a second copy.
+    sys.modules.setdefault("extract_cards", sys.modules[__name__])
     raise SystemExit(main())
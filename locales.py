@@ -0,0 +1,203 @@
+"""
+Per-locale string overlays on top of one base card dump.
+
+The base dump carries all structural data and the dbfId index; an overlay
+carries only the localized strings of each card:
+
+    {
+      "format": "hs-locale/1",
+      "locale": "deDE",
+      "strings": {"62442": {"name": "...", "text": "...", "flavor": "..."}}
+    }
+
+By default the overlay for <dir>/<stem>.json (or .hsidx/.sqlite) is
+<dir>/<stem>.<locale>.json. LocaleCatalog loads an overlay the first time a
+locale is requested; localized cards are views over the shared base records,
+so each extra locale costs only its strings. Strings missing from an overlay
+fall back to the base dump.
+
+Build an overlay from a full localized dump (per-locale, or HearthstoneJSON's
+"all" dump where strings are {locale: text} objects):
+
+    python locales.py --base data/standard_cards_aug_2025.json --dump cards.deDE.full.json --locale deDE
+"""
+import argparse
+import json
+import re
+import sys
+from pathlib import Path
+from typing import Iterable, Iterator, Mapping, Optional
+
+from extract_cards import ConfigError, DataError, IOErrorEx, as_plain_dict, build_card_index, load_cards
+
+LOCALE_FORMAT = "hs-locale/1"
+LOCALIZED_FIELDS = ("name", "text", "flavor")
+_LOCALE_RE = re.compile(r"^[a-z]{2}[A-Z]{2}$")
+
+
+def check_locale(locale: str) -> str:
+    if not isinstance(locale, str) or not _LOCALE_RE.match(locale):
+        raise ConfigError(f"'locale' must look like 'enUS' or 'deDE', got {locale!r}.")
+    return locale
+
+
+def overlay_path(source_file: str | Path, locale: str) -> Path:
+    source = Path(source_file)
+    return source.with_name(f"{source.stem}.{locale}.json")
+
+
+class LocalizedCard(Mapping):
+    """Read-only view of a base record with localized strings laid over it."""
+
+    __slots__ = ("_base", "_strings")
+
+    def __init__(self, base: Mapping, strings: Mapping[str, str]):
+        self._base = base
+        self._strings = strings
+
+    def __getitem__(self, key: str):
+        if key in self._strings:
+            return self._strings[key]
+        return self._base[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._base
+        yield from (k for k in self._strings if k not in self._base)
+
+    def __len__(self) -> int:
+        return len(self._base) + sum(1 for k in self._strings if k not in self._base)
+
+    def to_dict(self) -> dict:
+        return {**as_plain_dict(self._base), **self._strings}
+
+
+class LocalizedIndex(Mapping):
+    """dbfId -> LocalizedCard over a shared base index."""
+
+    def __init__(self, base: Mapping[int, Mapping], strings: Mapping[int, Mapping[str, str]], locale: str):
+        self._base = base
+        self._strings = strings
+        self.locale = locale
+
+    def __getitem__(self, dbf_id: int) -> Mapping:
+        card = self._base[dbf_id]
+        strings = self._strings.get(dbf_id)
+        return LocalizedCard(card, strings) if strings else card
+
+    def __contains__(self, dbf_id: object) -> bool:
+        return dbf_id in self._base
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._base)
+
+    def __len__(self) -> int:
+        return len(self._base)
+
+
+def load_overlay(path: str | Path, locale: Optional[str] = None) -> dict[int, dict[str, str]]:
+    """dbfId -> localized strings from an overlay file."""
+    p = Path(path)
+    try:
+        with p.open("r", encoding="utf-8") as f:
+            doc = json.load(f)
+    except Exception as e:
+        raise IOErrorEx(f"Error loading locale overlay: {e}") from e
+    if not isinstance(doc, dict) or doc.get("format") != LOCALE_FORMAT or not isinstance(doc.get("strings"), dict):
+        raise DataError(f"{p} is not a '{LOCALE_FORMAT}' locale overlay.")
+    if locale and doc.get("locale") != locale:
+        raise DataError(f"{p} holds locale {doc.get('locale')!r}, expected {locale!r}.")
+    try:
+        return {int(k): {f: v[f] for f in LOCALIZED_FIELDS if f in v} for k, v in doc["strings"].items()}
+    except (TypeError, ValueError) as e:
+        raise DataError(f"Malformed strings in locale overlay {p}.") from e
+
+
+class LocaleCatalog:
+    """Base index plus lazily loaded overlays, one per requested locale."""
+
+    def __init__(self, by_id: Mapping[int, Mapping], source_file: str | Path | None = None,
+                 overlay_files: Optional[Mapping[str, str | Path]] = None):
+        self.by_id = by_id
+        self.source_file = source_file
+        self._overlay_files = dict(overlay_files or {})
+        self._indexes: dict[str, LocalizedIndex] = {}
+
+    def overlay_file(self, locale: str) -> Path:
+        if locale in self._overlay_files:
+            return Path(self._overlay_files[locale])
+        if self.source_file is None:
+            raise ConfigError(f"No overlay file registered for locale '{locale}'.")
+        return overlay_path(self.source_file, locale)
+
+    def index(self, locale: Optional[str] = None) -> Mapping[int, Mapping]:
+        """Card index for locale (None: the base dump), loading its overlay on first use."""
+        if not locale:
+            return self.by_id
+        index = self._indexes.get(locale)
+        if index is None:
+            strings = load_overlay(self.overlay_file(check_locale(locale)), locale)
+            # Concurrent first requests may both load; either result is equivalent.
+            index = self._indexes.setdefault(locale, LocalizedIndex(self.by_id, strings, locale))
+        return index
+
+    @property
+    def loaded_locales(self) -> list[str]:
+        return sorted(self._indexes)
+
+
+def localize_index(by_id: Mapping[int, Mapping], raw_cfg: dict, source_file: str | Path) -> Mapping[int, Mapping]:
+    """Apply the config's 'locale' (and optional 'localeFile') to a card index."""
+    locale = raw_cfg.get("locale")
+    if not locale:
+        return by_id
+    files = {locale: raw_cfg["localeFile"]} if raw_cfg.get("localeFile") else None
+    return LocaleCatalog(by_id, source_file, files).index(locale)
+
+
+def build_overlay(base_cards: Iterable[Mapping], localized_cards: Iterable[Mapping], locale: str) -> dict:
+    """
+    Overlay document with the strings of localized_cards that differ from the
+    base dump. Cards missing from the base are skipped.
+    """
+    base = build_card_index(base_cards)
+    strings: dict[str, dict[str, str]] = {}
+    for card in localized_cards:
+        dbf_id = card.get("dbfId")
+        if dbf_id not in base:
+            continue
+        localized = {}
+        for field in LOCALIZED_FIELDS:
+            value = card.get(field)
+            if isinstance(value, dict):  # HearthstoneJSON "all" locales dump
+                value = value.get(locale)
+            if isinstance(value, str) and value != base[dbf_id].get(field):
+                localized[field] = value
+        if localized:
+            strings[str(dbf_id)] = localized
+    return {"format": LOCALE_FORMAT, "locale": locale, "strings": strings}
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build a locale overlay for a base card dump.")
+    parser.add_argument("--base", required=True, help="Base card dump (JSON, .hsidx or .sqlite)")
+    parser.add_argument("--dump", required=True, help="Full card dump in the target locale")
+    parser.add_argument("--locale", required=True, help="Locale code, e.g. deDE")
+    parser.add_argument("--output", help="Overlay path (default: <base stem>.<locale>.json)")
+    args = parser.parse_args(argv)
+    try:
+        locale = check_locale(args.locale)
+        overlay = build_overlay(load_cards(args.base), load_cards(args.dump), locale)
+        output = Path(args.output) if args.output else overlay_path(args.base, locale)
+        output.write_text(json.dumps(overlay, ensure_ascii=False, indent=2), encoding="utf-8")
+    except OSError as e:
+        print(f"Error writing output file: {e}", file=sys.stderr)
+        return 2
+    except (ConfigError, DataError, IOErrorEx) as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    print(f"Wrote {len(overlay['strings'])} localized cards to {output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
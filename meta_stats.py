@@ -0,0 +1,253 @@
+"""
+Meta-level card statistics over a corpus of deck codes.
+
+Card dbfIds are remapped to dense indices of the card pool and every chunk of
+decks is accumulated with np.unique/np.bincount into per-class arrays:
+
+    included[class, card]  decks of that class running the card
+    copies[class, card]    total copies across those decks
+
+A deck's class is the class of the hero in its deck code (see
+extract_cards.hero_class). When the hero is unknown it is inferred from the
+cards: every class listed by a card's `classes` (or `cardClass`) gets one vote
+per copy, NEUTRAL excluded, and the most-voted class wins; decks without class
+cards count as NEUTRAL.
+
+Aggregates over the same card pool can be merged, so corpora can be streamed
+in chunks and split across worker processes with flat memory per worker.
+Workers receive only (dbfId, classes) records and send back only the count
+arrays.
+"""
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Iterable, Iterator, Mapping, Optional
+
+import numpy as np
+
+from extract_cards import DataError, DeckCodeError, DeckParser, card_classes, hero_class, parse_deck_code_real
+
+DEFAULT_CHUNK = 10_000
+
+
+def _chunks(codes: Iterable[str], size: int) -> Iterator[list[str]]:
+    it = iter(codes)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+class MetaAggregate:
+    """Mergeable inclusion/copy counts for one card pool."""
+
+    def __init__(self, cards: Iterable[Mapping]):
+        pool = sorted(
+            ((c["dbfId"], card_classes(c)) for c in cards if isinstance(c.get("dbfId"), int)),
+            key=lambda item: item[0],
+        )
+        self.dbf_ids = np.asarray([d for d, _ in pool], dtype=np.int64)
+        self.class_names = sorted({k for _, ks in pool for k in ks} | {"NEUTRAL"})
+        col = {k: i for i, k in enumerate(self.class_names)}
+        self._membership = np.zeros((len(pool), len(self.class_names)), dtype=np.float64)
+        for row, (_, ks) in enumerate(pool):
+            self._membership[row, [col[k] for k in ks]] = 1.0
+        self._neutral = col["NEUTRAL"]
+        self._membership[:, self._neutral] = 0.0  # neutral cards never vote
+        self._class_cards = {d: {"classes": ks} for d, ks in pool}  # for hero_class (skins)
+
+        shape = (len(self.class_names), len(pool))
+        self.included = np.zeros(shape, dtype=np.int64)
+        self.copies = np.zeros(shape, dtype=np.int64)
+        self.decks_by_class = np.zeros(len(self.class_names), dtype=np.int64)
+        self.invalid_decks = 0
+        self.unknown_copies = 0
+
+    @property
+    def decks(self) -> int:
+        return int(self.decks_by_class.sum())
+
+    # -- Accumulation ---------------------------------------------------------
+
+    def add_decks(self, decks: Iterable[Iterable[int]], classes: Optional[Iterable[Optional[str]]] = None) -> None:
+        """
+        Accumulate decoded decks (dbfId lists with one entry per copy). classes
+        holds each deck's known class (e.g. its hero's); None entries are voted.
+        """
+        deck_rows: list[np.ndarray] = []
+        ids: list[np.ndarray] = []
+        n_decks = 0
+        for row, dbf_ids in enumerate(decks):
+            arr = np.fromiter(dbf_ids, dtype=np.int64)
+            deck_rows.append(np.full(arr.size, row, dtype=np.int64))
+            ids.append(arr)
+            n_decks = row + 1
+        if n_decks:
+            col = {k: i for i, k in enumerate(self.class_names)}
+            known = np.fromiter((col.get(k, -1) for k in classes), dtype=np.int64, count=n_decks) if classes is not None else None
+            self._accumulate(np.concatenate(deck_rows), np.concatenate(ids), n_decks, known)
+
+    def _accumulate(self, deck_rows: np.ndarray, ids: np.ndarray, n_decks: int, known_class: Optional[np.ndarray] = None) -> None:
+        n = len(self.dbf_ids)
+        idx = np.searchsorted(self.dbf_ids, ids)
+        known = idx < n
+        known[known] = self.dbf_ids[idx[known]] == ids[known]
+        self.unknown_copies += int((~known).sum())
+
+        key = deck_rows[known] * n + idx[known]
+        pairs, counts = np.unique(key, return_counts=True)
+        deck_of, card_of = pairs // n, pairs % n
+
+        votes = np.stack(
+            [np.bincount(deck_of, weights=counts * self._membership[card_of, k], minlength=n_decks)
+             for k in range(len(self.class_names))],
+            axis=1,
+        )
+        deck_class = np.where(votes.max(axis=1) > 0, votes.argmax(axis=1), self._neutral)
+        if known_class is not None:
+            deck_class = np.where(known_class >= 0, known_class, deck_class)
+
+        flat = deck_class[deck_of] * n + card_of
+        size = len(self.class_names) * n
+        self.included += np.bincount(flat, minlength=size).reshape(self.included.shape)
+        self.copies += np.bincount(flat, weights=counts, minlength=size).astype(np.int64).reshape(self.copies.shape)
+        self.decks_by_class += np.bincount(deck_class, minlength=len(self.class_names))
+
+    def add_deck_codes(
+        self,
+        codes: Iterable[str],
+        deck_parser: DeckParser = parse_deck_code_real,
+        chunk_size: int = DEFAULT_CHUNK,
+    ) -> "MetaAggregate":
+        """
+        Stream deck codes through the aggregate chunk by chunk; undecodable
+        codes are counted. Each deck is classed by its hero when it is known.
+        """
+        for chunk in _chunks(codes, chunk_size):
+            decoded, classes = [], []
+            for code in chunk:
+                try:
+                    deck = deck_parser(code)
+                except DeckCodeError:
+                    self.invalid_decks += 1
+                    continue
+                decoded.append(deck.cards)
+                classes.append(hero_class(deck.hero, self._class_cards))
+            self.add_decks(decoded, classes)
+        return self
+
+    def counts(self) -> tuple:
+        """The mergeable count arrays (see merge_counts); what worker processes send back."""
+        return self.included, self.copies, self.decks_by_class, self.invalid_decks, self.unknown_copies
+
+    def merge_counts(self, counts: tuple) -> "MetaAggregate":
+        """Add counts() of another aggregate over the same card pool."""
+        included, copies, decks_by_class, invalid_decks, unknown_copies = counts
+        if included.shape != self.included.shape:
+            raise DataError("Cannot merge meta aggregates built from different card pools.")
+        self.included += included
+        self.copies += copies
+        self.decks_by_class += decks_by_class
+        self.invalid_decks += invalid_decks
+        self.unknown_copies += unknown_copies
+        return self
+
+    def merge(self, other: "MetaAggregate") -> "MetaAggregate":
+        """Add another aggregate over the same card pool into this one."""
+        if not np.array_equal(self.dbf_ids, other.dbf_ids) or self.class_names != other.class_names:
+            raise DataError("Cannot merge meta aggregates built from different card pools.")
+        return self.merge_counts(other.counts())
+
+    # -- Reporting ------------------------------------------------------------
+
+    def inclusion_rates(self, deck_class: Optional[str] = None) -> dict[int, float]:
+        """dbfId -> share of decks (of deck_class, if it was seen) running the card."""
+        if deck_class in self.class_names and self.decks_by_class[self.class_names.index(deck_class)]:
+            k = self.class_names.index(deck_class)
+            included, total = self.included[k], self.decks_by_class[k]
+        else:
+            included, total = self.included.sum(axis=0), max(self.decks, 1)
+        hit = np.flatnonzero(included)
+        return {int(self.dbf_ids[i]): float(included[i] / total) for i in hit}
+
+    def report(self, by_id: Optional[Mapping[int, Mapping]] = None) -> dict:
+        """
+        JSON-ready summary; cards ordered by overall inclusion rate. With by_id,
+        card names are included for readability.
+        """
+        total = max(self.decks, 1)
+        included = self.included.sum(axis=0)
+        copies = self.copies.sum(axis=0)
+        cards = []
+        for i in np.argsort(-included, kind="stable"):
+            if not included[i]:
+                break
+            dbf_id = int(self.dbf_ids[i])
+            entry: dict = {"dbfId": dbf_id}
+            if by_id is not None and dbf_id in by_id:
+                entry["name"] = by_id[dbf_id].get("name")
+            entry["decks"] = int(included[i])
+            entry["inclusionRate"] = round(included[i] / total, 4)
+            entry["avgCopies"] = round(copies[i] / included[i], 4)
+            entry["byClass"] = {
+                name: {
+                    "inclusionRate": round(self.included[k, i] / self.decks_by_class[k], 4),
+                    "avgCopies": round(self.copies[k, i] / self.included[k, i], 4),
+                }
+                for k, name in enumerate(self.class_names)
+                if self.included[k, i]
+            }
+            cards.append(entry)
+        return {
+            "decks": self.decks,
+            "invalidDecks": self.invalid_decks,
+            "unknownCopies": self.unknown_copies,
+            "decksByClass": {
+                name: int(n) for name, n in zip(self.class_names, self.decks_by_class) if n
+            },
+            "cards": cards,
+        }
+
+
+# -- Parallel aggregation -------------------------------------------------------
+
+_WORKER_CARDS: list[dict] = []
+_WORKER_PARSER: DeckParser = parse_deck_code_real
+
+
+def _init_worker(cards: list[dict], deck_parser: DeckParser) -> None:
+    global _WORKER_CARDS, _WORKER_PARSER
+    _WORKER_CARDS, _WORKER_PARSER = cards, deck_parser
+
+
+def _aggregate_chunk(codes: list[str]) -> tuple:
+    return MetaAggregate(_WORKER_CARDS).add_deck_codes(codes, _WORKER_PARSER, len(codes) or 1).counts()
+
+
+def aggregate_deck_codes(
+    codes: Iterable[str],
+    cards: list[dict],
+    deck_parser: DeckParser = parse_deck_code_real,
+    workers: Optional[int] = 1,
+    chunk_size: int = DEFAULT_CHUNK,
+) -> MetaAggregate:
+    """
+    Aggregate a (streamed) corpus. With workers > 1 (or None for all cores),
+    chunks are aggregated in a process pool and the partial counts merged;
+    the parser must then be picklable (a module-level function).
+    """
+    if workers == 1:
+        return MetaAggregate(cards).add_deck_codes(codes, deck_parser, chunk_size)
+    total = MetaAggregate(cards)
+    # Workers only need what MetaAggregate reads: dbfId and classes.
+    pool_cards = [{"dbfId": c["dbfId"], "classes": card_classes(c)} for c in cards if isinstance(c.get("dbfId"), int)]
+    limit = 2 * (workers or os.cpu_count() or 1)  # bounded queue keeps memory flat
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(pool_cards, deck_parser)) as pool:
+        pending = set()
+        for chunk in _chunks(codes, chunk_size):
+            pending.add(pool.submit(_aggregate_chunk, chunk))
+            if len(pending) >= limit:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    total.merge_counts(future.result())
+        for future in pending:
+            total.merge_counts(future.result())
+    return total
@@ -0,0 +1,193 @@
+"""
+Parallel index build for large card dumps.
+
+The top-level JSON array is split into byte ranges that each hold whole card
+objects, the ranges are parsed as "[" + chunk + "]" in a process pool, and the
+parsed cards are merged into the dbfId index with duplicate detection. Workers
+hand chunks back marshalled, which the parent loads faster than it could
+unpickle (or parse) them.
+
+Boundaries are the "}" "," "{" separators between top-level objects, found
+near evenly spaced target offsets. The separator must use the whitespace that
+precedes the first object, which is unambiguous for indented dumps: JSON
+strings cannot contain raw newlines, and nested objects are indented deeper.
+For compact dumps a split can land inside a card; that chunk then fails to
+parse and the whole file is parsed serially instead.
+
+    python parallel_index.py --source data/cards.enUS.json data/cards.deDE.json --workers 8
+
+writes <source>.hsidx next to each dump (see extract_cards.dump_card_index).
+With at least as many dumps as workers, whole files are indexed in parallel
+instead, so nothing but the duplicate report crosses process boundaries.
+"""
+import argparse
+import json
+import marshal
+import mmap
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Optional
+
+from extract_cards import (
+    INDEX_SUFFIX,
+    ConfigError,
+    DataError,
+    IOErrorEx,
+    _eprint,
+    dump_card_index,
+    load_cards,
+)
+
+MIN_PARALLEL_BYTES = 8 << 20  # smaller dumps parse faster than a pool starts
+ON_DUPLICATE = ("last", "first", "error")
+
+
+def split_array(buf: bytes | mmap.mmap, parts: int) -> Optional[list[tuple[int, int]]]:
+    """
+    Byte ranges (start, end) of up to `parts` object-aligned chunks of the
+    top-level array in buf; None when buf is not a non-empty array of objects.
+    """
+    head = re.compile(rb"\s*\[(\s*)\{").match(buf)
+    end = buf.rfind(b"]")
+    if head is None or end < 0:
+        return None
+    separator = re.compile(rb"\}\s*," + re.escape(head.group(1)) + rb"\{")
+    start = head.end() - 1
+    bounds = [start]
+    step = max((end - start) // max(parts, 1), 1)
+    for i in range(1, parts):
+        match = separator.search(buf, max(start + i * step, bounds[-1] + 1), end)
+        if match is None:
+            break
+        bounds.append(match.end() - 1)  # next chunk starts at the "{"
+    tail = buf.rfind(b"}", start, end) + 1
+    ranges = []
+    for i, lo in enumerate(bounds):
+        if i + 1 < len(bounds):
+            # Cut just after the closing "}" of the last object in this chunk.
+            hi = buf.rfind(b"}", lo, bounds[i + 1]) + 1
+        else:
+            hi = tail
+        ranges.append((lo, hi))
+    return ranges
+
+
+def _parse_range(path: str, start: int, end: int) -> bytes:
+    with open(path, "rb") as fh:
+        fh.seek(start)
+        chunk = fh.read(end - start)
+    return marshal.dumps(json.loads(b"[" + chunk + b"]"))
+
+
+def load_cards_parallel(source_file: str | Path, workers: Optional[int] = None) -> list[dict]:
+    """
+    Same result as load_cards for JSON dumps, parsed in `workers` processes
+    (None: all cores). Small files, other formats and dumps that cannot be
+    split cleanly are parsed serially.
+    """
+    path = Path(source_file)
+    workers = workers or os.cpu_count() or 1
+    try:
+        size = path.stat().st_size
+    except OSError as e:
+        raise IOErrorEx(f"Error loading source file: {e}") from e
+    if workers == 1 or size < MIN_PARALLEL_BYTES or path.suffix != ".json":
+        return load_cards(path)
+
+    with path.open("rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+        ranges = split_array(buf, workers * 2)
+    if not ranges or len(ranges) == 1:
+        return load_cards(path)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = list(pool.map(_parse_range, [str(path)] * len(ranges), *zip(*ranges)))
+    except ValueError:
+        _eprint("Could not split source on object boundaries; parsing serially")
+        return load_cards(path)
+    cards = [card for blob in chunks for card in marshal.loads(blob)]
+    _eprint(f"Loaded {len(cards)} cards from source ({len(ranges)} chunks)")
+    return cards
+
+
+def index_cards(cards: Iterable[dict], on_duplicate: str = "last") -> tuple[dict[int, dict], list[int]]:
+    """
+    dbfId index plus the sorted dbfIds that occur more than once.
+    on_duplicate: 'last' keeps the later card (as build_card_index does),
+    'first' keeps the earlier one, 'error' raises DataError. Cards without an
+    integer dbfId cannot be looked up and are left out.
+    """
+    if on_duplicate not in ON_DUPLICATE:
+        raise ConfigError(f"'on_duplicate' must be one of: {', '.join(ON_DUPLICATE)}.")
+    by_id: dict[int, dict] = {}
+    duplicates: set[int] = set()
+    for card in cards:
+        dbf_id = card.get("dbfId")
+        if not isinstance(dbf_id, int):
+            continue
+        if dbf_id in by_id:
+            duplicates.add(dbf_id)
+            if on_duplicate == "first":
+                continue
+        by_id[dbf_id] = card
+    if duplicates and on_duplicate == "error":
+        shown = ", ".join(map(str, sorted(duplicates)[:10]))
+        raise DataError(f"Duplicate dbfIds in source: {shown}{' ...' if len(duplicates) > 10 else ''}")
+    return by_id, sorted(duplicates)
+
+
+def build_index_file(
+    source_file: str | Path,
+    output: str | Path | None = None,
+    workers: Optional[int] = None,
+    on_duplicate: str = "last",
+) -> tuple[Path, list[int]]:
+    """
+    Parse source_file in parallel and write a precompiled .hsidx holding the
+    deduplicated cards in source order. Returns the path and the duplicates.
+    """
+    source = Path(source_file)
+    by_id, duplicates = index_cards(load_cards_parallel(source, workers), on_duplicate)
+    target = Path(output) if output else source.with_suffix(INDEX_SUFFIX)
+    try:
+        target.write_bytes(dump_card_index(list(by_id.values())))
+    except OSError as e:
+        raise IOErrorEx(f"Error writing output file: {e}") from e
+    return target, duplicates
+
+
+def build_index_files(
+    sources: list[str | Path], workers: Optional[int] = None, on_duplicate: str = "last"
+) -> list[tuple[Path, list[int]]]:
+    """build_index_file for many dumps: one file per worker when there are enough files."""
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(sources) >= workers:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(build_index_file, s, None, 1, on_duplicate) for s in sources]
+            return [f.result() for f in futures]
+    return [build_index_file(s, None, workers, on_duplicate) for s in sources]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build .hsidx indexes from card dumps in parallel.")
+    parser.add_argument("--source", nargs="+", required=True, help="Card dump(s) to index")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument("--on-duplicate", choices=ON_DUPLICATE, default="last")
+    args = parser.parse_args(argv)
+
+    try:
+        built = build_index_files(args.source, args.workers, args.on_duplicate)
+    except (ConfigError, DataError, IOErrorEx) as e:
+        print(str(e), file=sys.stderr)
+        return 2
+    for source, (target, duplicates) in zip(args.source, built):
+        if duplicates:
+            print(f"{source}: {len(duplicates)} duplicate dbfIds ({args.on_duplicate} kept)", file=sys.stderr)
+        print(f"Wrote {target}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
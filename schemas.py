@@ -10,11 +10,59 @@ config_schema = {
             "items": {"type": "integer"}
         },
         "basic": {"type": "boolean"},
-        "outputFile": {"type": "string"}
+        "outputFile": {"type": "string"},
+        "mode": {"enum": ["extract", "batch", "meta", "dedupe", "validate", "suggest"]},
+        "workers": {"type": ["integer", "null"], "minimum": 1},
+        "deckCodes": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "deckCodesFile": {"type": "string"},
+        "locale": {"type": "string", "pattern": "^[a-z]{2}[A-Z]{2}$"},
+        "localeFile": {"type": "string"},
+        "canonical": {"type": "boolean"},
+        "stats": {"type": "boolean"},
+        "legalSets": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "deckSize": {"type": "integer", "minimum": 1},
+        "invalidOnly": {"type": "boolean"},
+        "suggest": {
+            "type": "object",
+            "properties": {
+                "topK": {"type": "integer", "minimum": 1},
+                "deckClass": {"type": "string"},
+                "weights": {
+                    "type": "object",
+                    "properties": {
+                        "curve": {"type": "number"},
+                        "synergy": {"type": "number"},
+                        "meta": {"type": "number"}
+                    },
+                    "additionalProperties": False
+                }
+            }
+        },
+        "drawOdds": {
+            "oneOf": [
+                {"type": "boolean"},
+                {
+                    "type": "object",
+                    "properties": {
+                        "turns": {"type": "integer", "minimum": 1},
+                        "mulligan": {"type": "boolean"},
+                        "groups": {"enum": ["curve", "types", "spellSchools", "races", "mechanics"]}
+                    }
+                }
+            ]
+        }
     },
     "required": ["sourceFile"],
     "anyOf": [
         { "required": ["deckCode"] },
-        { "required": ["ids"] }
+        { "required": ["ids"] },
+        { "required": ["deckCodes"] },
+        { "required": ["deckCodesFile"] }
     ]
 }
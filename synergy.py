@@ -0,0 +1,237 @@
+"""
+Card-pool synergy scores from structured card fields.
+
+Each card gets two feature rows over one vocabulary of tags:
+  * provides: its `mechanics`, `races` (as race:X) and `spellSchool` (as school:X)
+  * wants:    its `referencedTags` (e.g. a card that buffs Taunt minions)
+Rows are IDF-weighted (rare shared tags count more) and L2-normalized, and
+
+    score(a, b) = SIMILARITY * provides_a . provides_b
+                + wants_a . provides_b + provides_a . wants_b
+                + RELATED  * [a and b reference each other via relatedCardDbfIds]
+
+The full card x card matrix is computed in row blocks with matrix products and
+kept only as the top-k partners per card. The index is cached on disk next to
+the source (or at an explicit path) and rebuilt when the source's SHA-256 changes.
+"""
+import hashlib
+import os
+import zipfile
+from pathlib import Path
+from typing import Iterable, Mapping, Optional
+
+import numpy as np
+
+from extract_cards import DataError, IOErrorEx, card_classes, load_cards
+
+SIMILARITY = 0.5
+RELATED = 1.0
+DEFAULT_TOP_K = 50
+CACHE_SUFFIX = ".synergy.npz"
+_CACHE_VERSION = 1
+
+
+def _features(card: Mapping) -> tuple[list[str], list[str]]:
+    provides = list(card.get("mechanics") or ())
+    provides += [f"race:{r}" for r in card.get("races") or ()]
+    if card.get("spellSchool"):
+        provides.append(f"school:{card['spellSchool']}")
+    return provides, list(card.get("referencedTags") or ())
+
+
+def _normalized(rows: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(rows, axis=1, keepdims=True)
+    return np.divide(rows, norms, out=np.zeros_like(rows), where=norms > 0)
+
+
+def feature_matrices(cards: list[Mapping]) -> tuple[np.ndarray, np.ndarray]:
+    """IDF-weighted, L2-normalized (provides, wants) rows for cards, in order."""
+    vocab: dict[str, int] = {}
+    coords: list[tuple[int, int, bool]] = []  # (row, column, is_want)
+    for row, card in enumerate(cards):
+        provides, wants = _features(card)
+        coords += [(row, vocab.setdefault(tag, len(vocab)), False) for tag in provides]
+        coords += [(row, vocab.setdefault(tag, len(vocab)), True) for tag in wants]
+    n, width = len(cards), max(len(vocab), 1)
+    provides_m = np.zeros((n, width), dtype=np.float32)
+    wants_m = np.zeros((n, width), dtype=np.float32)
+    if coords:
+        rows, cols, is_want = (np.asarray(a) for a in zip(*coords))
+        provides_m[rows[~is_want], cols[~is_want]] = 1.0
+        wants_m[rows[is_want], cols[is_want]] = 1.0
+    idf = np.log((1 + n) / (1 + (provides_m > 0).sum(axis=0))).astype(np.float32) + 1.0
+    return _normalized(provides_m * idf), _normalized(wants_m * idf)
+
+
+def source_fingerprint(source_file: str | Path) -> str:
+    digest = hashlib.sha256()
+    try:
+        with Path(source_file).open("rb") as fh:
+            for block in iter(lambda: fh.read(1 << 20), b""):
+                digest.update(block)
+    except OSError as e:
+        raise IOErrorEx(f"Error reading source file: {e}") from e
+    return digest.hexdigest()
+
+
+class SynergyIndex:
+    """Feature matrices plus precomputed top-k synergy partners for one card pool."""
+
+    def __init__(
+        self,
+        dbf_ids: np.ndarray,
+        class_names: list[str],
+        classes: np.ndarray,
+        provides: np.ndarray,
+        wants: np.ndarray,
+        related: np.ndarray,
+        top_ids: np.ndarray,
+        top_scores: np.ndarray,
+        fingerprint: str = "",
+    ):
+        self.dbf_ids = dbf_ids            # (n,) int64
+        self.class_names = class_names    # column labels of `classes`
+        self.classes = classes            # (n, len(class_names)) bool
+        self.provides = provides          # (n, vocab) float32
+        self.wants = wants                # (n, vocab) float32
+        self.related = related            # (pairs, 2) int64 row indices, symmetric
+        self.top_ids = top_ids            # (n, k) int64 row indices, best first
+        self.top_scores = top_scores      # (n, k) float32
+        self.fingerprint = fingerprint
+        self._row = {int(d): i for i, d in enumerate(dbf_ids)}
+
+    # -- Building -------------------------------------------------------------
+
+    @classmethod
+    def build(cls, cards: Iterable[Mapping], top_k: int = DEFAULT_TOP_K, block: int = 512) -> "SynergyIndex":
+        cards = [c for c in cards if isinstance(c.get("dbfId"), int)]
+        if not cards:
+            raise DataError("No cards with a dbfId to index.")
+        dbf_ids = np.asarray([c["dbfId"] for c in cards], dtype=np.int64)
+        row_of = {int(d): i for i, d in enumerate(dbf_ids)}
+
+        provides_m, wants_m = feature_matrices(cards)
+        n = len(cards)
+
+        per_card = [card_classes(c) for c in cards]
+        class_names = sorted({k for ks in per_card for k in ks})
+        class_col = {k: i for i, k in enumerate(class_names)}
+        classes = np.zeros((n, len(class_names)), dtype=bool)
+        for row, ks in enumerate(per_card):
+            classes[row, [class_col[k] for k in ks]] = True
+
+        pairs = {
+            (row, row_of[rel])
+            for row, card in enumerate(cards)
+            for rel in card.get("relatedCardDbfIds") or ()
+            if rel in row_of and row_of[rel] != row
+        }
+        pairs |= {(b, a) for a, b in pairs}
+        related = np.asarray(sorted(pairs), dtype=np.int64).reshape(-1, 2)
+
+        index = cls(dbf_ids, class_names, classes, provides_m, wants_m, related,
+                    np.empty((n, 0), np.int64), np.empty((n, 0), np.float32))
+        index.top_ids, index.top_scores = index._all_top_k(min(top_k, n - 1), block)
+        return index
+
+    def _score_rows(self, rows: np.ndarray) -> np.ndarray:
+        p, w = self.provides, self.wants
+        scores = SIMILARITY * (p[rows] @ p.T) + w[rows] @ p.T + p[rows] @ w.T
+        if self.related.size:
+            hit = np.isin(self.related[:, 0], rows)
+            local = np.searchsorted(rows, self.related[hit, 0])
+            scores[local, self.related[hit, 1]] += RELATED
+        scores[np.arange(len(rows)), rows] = -np.inf
+        return scores
+
+    def _all_top_k(self, k: int, block: int) -> tuple[np.ndarray, np.ndarray]:
+        n = len(self.dbf_ids)
+        top_ids = np.empty((n, k), dtype=np.int64)
+        top_scores = np.empty((n, k), dtype=np.float32)
+        for start in range(0, n, block):
+            rows = np.arange(start, min(start + block, n))
+            scores = self._score_rows(rows)
+            part = np.argpartition(-scores, k - 1, axis=1)[:, :k] if k else np.empty((len(rows), 0), np.int64)
+            part_scores = np.take_along_axis(scores, part, axis=1)
+            order = np.argsort(-part_scores, axis=1, kind="stable")
+            top_ids[rows] = np.take_along_axis(part, order, axis=1)
+            top_scores[rows] = np.take_along_axis(part_scores, order, axis=1)
+        return top_ids, top_scores
+
+    # -- Queries --------------------------------------------------------------
+
+    def top_k(self, dbf_id: int, k: int = 10, same_class: bool = False) -> list[tuple[int, float]]:
+        """
+        Best synergy partners for dbf_id as (dbfId, score), best first, skipping
+        zero scores. same_class keeps partners sharing a class with the card
+        (neutral cards always qualify).
+        """
+        row = self._row.get(dbf_id)
+        if row is None:
+            raise DataError(f"Card {dbf_id} is not in the synergy index.")
+        if not same_class and k <= self.top_ids.shape[1]:
+            ids, scores = self.top_ids[row, :k], self.top_scores[row, :k]
+        else:
+            scores_row = self._score_rows(np.asarray([row]))[0]
+            if same_class:
+                playable = (self.classes & self.classes[row]).any(axis=1)
+                if "NEUTRAL" in self.class_names:
+                    playable |= self.classes[:, self.class_names.index("NEUTRAL")]
+                scores_row = np.where(playable, scores_row, -np.inf)
+            k = min(k, len(scores_row))
+            ids = np.argsort(-scores_row, kind="stable")[:k]
+            scores = scores_row[ids]
+        return [(int(self.dbf_ids[i]), round(float(s), 4)) for i, s in zip(ids, scores) if s > 0]
+
+    # -- Persistence ----------------------------------------------------------
+
+    def save(self, path: str | Path) -> None:
+        """Write the cache atomically: a temp file next to path, then renamed over it."""
+        target = Path(path)
+        tmp = target.with_name(target.name + ".tmp")
+        try:
+            with tmp.open("wb") as fh:
+                np.savez(
+                    fh,
+                    version=np.int64(_CACHE_VERSION),
+                    fingerprint=np.str_(self.fingerprint),
+                    class_names=np.asarray(self.class_names, dtype=str),
+                    dbf_ids=self.dbf_ids, classes=self.classes, provides=self.provides,
+                    wants=self.wants, related=self.related,
+                    top_ids=self.top_ids, top_scores=self.top_scores,
+                )
+            os.replace(tmp, target)
+        except OSError as e:
+            raise IOErrorEx(f"Error writing synergy cache: {e}") from e
+
+    @classmethod
+    def load(cls, path: str | Path) -> Optional["SynergyIndex"]:
+        """Load a cache file; None when missing, truncated or written by another version."""
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data["version"]) != _CACHE_VERSION:
+                    return None
+                index = cls(
+                    data["dbf_ids"], data["class_names"].tolist(), data["classes"], data["provides"],
+                    data["wants"], data["related"], data["top_ids"], data["top_scores"],
+                    str(data["fingerprint"]),
+                )
+        except (OSError, KeyError, ValueError, EOFError, zipfile.BadZipFile):
+            return None
+        return index
+
+    @classmethod
+    def for_source(
+        cls, source_file: str | Path, cache_path: str | Path | None = None, top_k: int = DEFAULT_TOP_K
+    ) -> "SynergyIndex":
+        """Cached index for a source file; rebuilt (and re-cached) when the source changed."""
+        source = Path(source_file)
+        cache = Path(cache_path) if cache_path else source.with_name(source.name + CACHE_SUFFIX)
+        fingerprint = source_fingerprint(source)
+        index = cls.load(cache) if cache.exists() else None
+        if index is not None and index.fingerprint == fingerprint and index.top_ids.shape[1] >= min(top_k, len(index.dbf_ids) - 1):
+            return index
+        index = cls.build(load_cards(source), top_k)
+        index.fingerprint = fingerprint
+        index.save(cache)
+        return index
@@ -0,0 +1,68 @@
+import json
+from pathlib import Path
+
+import extract_cards as ec
+from batch_format import BATCH_FORMAT, BatchReader
+
+
+def _write_cards(tmp_path: Path) -> Path:
+    cards = [
+        {"dbfId": 1, "name": "Alpha", "cost": 1, "attack": 1, "health": 1, "text": "A.", "rarity": "Common"},
+        {"dbfId": 2, "name": "Bravo", "cost": 2, "attack": 2, "health": 2, "text": "B.", "rarity": "Rare"},
+        {"dbfId": 3, "name": "Charlie", "cost": 3, "attack": 3, "health": 3, "text": "C.", "rarity": "Epic"},
+    ]
+    p = tmp_path / "cards.json"
+    p.write_text(json.dumps(cards, ensure_ascii=False), encoding="utf-8")
+    return p
+
+
+def _fake_decoder(code: str) -> list[int]:
+    decks = {"DECK-A": [1, 1, 2], "DECK-B": [2, 3, 3, 99]}
+    if code not in decks:
+        raise ec.DeckCodeError("invalid code")
+    return decks[code]
+
+
+def test_batch_mode_shares_card_table_and_rehydrates_decks(tmp_path, monkeypatch):
+    src = _write_cards(tmp_path)
+    out = tmp_path / "batch.json"
+    codes = tmp_path / "codes.txt"
+    codes.write_text("# weekly snapshot\nDECK-B\n\nBROKEN\n", encoding="utf-8")
+    cfg = {
+        "sourceFile": str(src),
+        "mode": "batch",
+        "deckCodes": ["DECK-A"],
+        "deckCodesFile": str(codes),
+        "basic": True,
+        "outputFile": str(out),
+    }
+    cfg_path = tmp_path / "cfg.json"
+    cfg_path.write_text(json.dumps(cfg), encoding="utf-8")
+    monkeypatch.setattr(ec, "DECK_DECODER", _fake_decoder)
+
+    assert ec.main(["--config", str(cfg_path)]) == 0
+
+    doc = json.loads(out.read_text(encoding="utf-8"))
+    assert doc["format"] == BATCH_FORMAT
+    # Each dbfId stored once, projected to basic fields; unknown id 99 dropped
+    assert [c["dbfId"] for c in doc["cards"]] == [1, 2, 3]
+    assert all("rarity" not in c for c in doc["cards"])
+
+    reader = BatchReader.from_file(out)
+    assert len(reader) == 3
+    assert [reader.deck_code(i) for i in range(3)] == ["DECK-A", "DECK-B", "BROKEN"]
+    deck_b = reader.deck(1)
+    assert [(e["name"], e["countFromDeck"]) for e in deck_b] == [("Bravo", 1), ("Charlie", 2)]
+    assert deck_b[1]["displayName"] == "Charlie ×2"
+    assert reader.deck(2) == [] and reader.deck_error(2)
+    # Rehydration never mutates the shared table
+    assert "countFromDeck" not in reader.cards[0]
+
+
+def test_batch_mode_requires_deck_codes(tmp_path, capsys):
+    src = _write_cards(tmp_path)
+    cfg_path = tmp_path / "cfg.json"
+    cfg_path.write_text(json.dumps({"sourceFile": str(src), "mode": "batch", "ids": [1]}), encoding="utf-8")
+
+    assert ec.main(["--config", str(cfg_path)]) == 2
+    assert "requires 'deckCodes' or 'deckCodesFile'" in capsys.readouterr().err
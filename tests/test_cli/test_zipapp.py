@@ -0,0 +1,71 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import extract_cards as ec
+from build_zipapp import build_zipapp
+
+
+def _write_cards(tmp_path: Path) -> Path:
+    cards = [
+        {"dbfId": 1, "name": "Alpha", "cost": 1, "attack": 1, "health": 1, "text": "A."},
+        {"dbfId": 2, "name": "Bravo", "cost": 2, "attack": 2, "health": 2, "text": "B."},
+    ]
+    p = tmp_path / "cards.json"
+    p.write_text(json.dumps(cards, ensure_ascii=False), encoding="utf-8")
+    return p
+
+
+def test_card_index_round_trips_and_loads_as_source(tmp_path):
+    cards = json.loads(_write_cards(tmp_path).read_text(encoding="utf-8"))
+    idx = tmp_path / "cards.hsidx"
+    idx.write_bytes(ec.dump_card_index(cards))
+
+    assert ec.load_cards(idx) == cards
+
+
+def test_card_index_rejects_foreign_header(tmp_path):
+    idx = tmp_path / "bogus.hsidx"
+    idx.write_bytes(b"not an index")
+    with pytest.raises(ec.DataError):
+        ec.load_cards(idx)
+
+
+def test_zipapp_serves_embedded_index_without_source_on_disk(tmp_path):
+    (tmp_path / "build").mkdir()
+    src = _write_cards(tmp_path / "build")
+    pyz = build_zipapp(src, tmp_path / "dist" / "app.pyz")
+    src.unlink()  # the app must not need the original dump any more
+
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({"sourceFile": "data/cards.json", "ids": [2], "basic": True}), encoding="utf-8")
+    proc = subprocess.run(
+        [sys.executable, str(pyz), "--config", str(cfg)],
+        capture_output=True,
+        text=True,
+        cwd=tmp_path,
+    )
+
+    assert proc.returncode == 0, proc.stderr
+    assert json.loads(proc.stdout) == [{"name": "Bravo", "cost": 2, "attack": 2, "health": 2, "text": "B.", "dbfId": 2}]
+    assert "Loaded 2 cards" in proc.stderr
+
+
+def test_deck_codes_are_parsed_without_importing_hearthstone():
+    from hearthstone.deckstrings import parse_deckstring, write_deckstring
+    from hearthstone.enums import FormatType
+
+    code = write_deckstring([(1, 1), (5, 2), (300, 3)], [637], FormatType.FT_STANDARD, [(7, 1, 90749), (8, 2, 90749)])
+    cards, heroes, _fmt, sideboards = parse_deckstring(code)
+    assert ec.parse_deck_code_real(code) == ec.ParsedDeck(
+        [d for d, n in cards for _ in range(n)], heroes[0], [tuple(sb) for sb in sideboards]
+    )
+    with pytest.raises(ec.DeckCodeError):
+        ec.parse_deck_code_real("not-a-deck-code")
+
+    probe = f"import sys, extract_cards; extract_cards.decode_deck_code_real({code!r}); print('hearthstone' in sys.modules)"
+    proc = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, cwd=Path(ec.__file__).parent)
+    assert proc.stdout.strip() == "False", proc.stderr
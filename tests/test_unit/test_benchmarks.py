@@ -0,0 +1,45 @@
+from collections import Counter
+
+import extract_cards as ec
+from benchmarks.bench_pipeline import STAGES, compare, parse_sizes, run_case
+from benchmarks.synthetic import generate_cards, generate_deck_codes, write_dump
+
+
+def test_generator_is_deterministic_and_shaped_like_the_dump():
+    cards = generate_cards(300, seed=3)
+
+    assert cards == generate_cards(300, seed=3)
+    assert cards != generate_cards(300, seed=4)
+    assert len({c["dbfId"] for c in cards}) == 300
+    assert any("audio2" in c for c in cards)
+    assert {"id", "dbfId", "name", "cost", "rarity", "classes"} <= set(cards[0])
+
+
+def test_deck_codes_decode_to_legal_decks():
+    cards = generate_cards(300, seed=1)
+    by_id = ec.build_card_index(cards)
+
+    for code in generate_deck_codes(cards, 20, seed=1):
+        counts = Counter(ec.decode_deck_code_real(code))
+        assert sum(counts.values()) == 30
+        assert len({by_id[d]["cardClass"] for d in counts} - {"NEUTRAL"}) <= 1
+        assert all(n <= (1 if by_id[d]["rarity"] == "Legendary" else 2) for d, n in counts.items())
+
+
+def test_run_case_reports_every_stage(tmp_path):
+    dump = tmp_path / "cards.json"
+    cards = write_dump(dump, 200)
+    results = run_case(dump, generate_deck_codes(cards, 5), repeat=1)
+
+    assert tuple(results) == STAGES
+    assert all(r["seconds"] >= 0 and r["peakBytes"] > 0 for r in results.values())
+
+
+def test_compare_flags_only_regressions_beyond_threshold_and_noise():
+    baseline = {"case": {"decode": {"seconds": 0.1, "peakBytes": 1 << 20}}}
+
+    assert compare({"case": {"decode": {"seconds": 0.12, "peakBytes": 1 << 20}}}, baseline, 0.25) == []
+    assert compare({"case": {"decode": {"seconds": 0.2, "peakBytes": 1 << 20}}}, baseline, 0.25)
+    assert compare({"case": {"decode": {"seconds": 0.1, "peakBytes": 4 << 20}}}, baseline, 0.25)
+    assert compare({"other": {"decode": {"seconds": 9.0, "peakBytes": 0}}}, baseline, 0.25) == []
+    assert parse_sizes("1k, 30k,200") == [1000, 30000, 200]
@@ -0,0 +1,58 @@
+import threading
+
+import pytest
+
+import extract_cards as ec
+from card_repository import CardRepository, CardSnapshot
+
+
+def _snapshot(version: str) -> CardSnapshot:
+    cards = [
+        {"dbfId": 1, "name": f"Alpha-{version}", "cost": 1, "rarity": "Common"},
+        {"dbfId": 2, "name": f"Beta-{version}", "cost": 2, "rarity": "Rare"},
+    ]
+    return CardSnapshot.from_cards(cards, source=version)
+
+
+def test_extract_uses_injected_decoder_and_leaves_snapshot_untouched(monkeypatch):
+    # Globals must not be consulted by the library API
+    monkeypatch.setattr(ec, "DECK_DECODER", lambda _s: pytest.fail("global decoder used"))
+    repo = CardRepository(_snapshot("v1"))
+
+    out = repo.extract(deck_code="ANY", basic=True, deck_decoder=lambda _s: [1, 1, 2])
+
+    assert [(e["name"], e["countFromDeck"]) for e in out] == [("Alpha-v1", 2), ("Beta-v1", 1)]
+    assert "rarity" not in out[0]
+    assert "countFromDeck" not in repo.get(1)
+
+
+def test_extract_requires_resolvable_ids():
+    repo = CardRepository(_snapshot("v1"))
+    with pytest.raises(ec.DataError):
+        repo.extract(ids=[])
+
+
+def test_swap_is_atomic_for_concurrent_readers():
+    repo = CardRepository(_snapshot("v0"))
+    errors: list[str] = []
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            names = [e["name"] for e in repo.extract(ids=[1, 2])]
+            # Both entries must come from the same snapshot
+            if names[0].split("-")[1] != names[1].split("-")[1]:
+                errors.append(repr(names))
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for i in range(1, 200):
+        previous = repo.swap(_snapshot(f"v{i}"))
+        assert previous.source == f"v{i - 1}"
+    stop.set()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert repo.snapshot.source == "v199"
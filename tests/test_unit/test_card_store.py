@@ -0,0 +1,80 @@
+import json
+import os
+import sqlite3
+
+import pytest
+
+import extract_cards as ec
+from card_store import CardStore, import_cards
+
+CARDS = [
+    {"dbfId": 3, "name": "Gamma", "cost": 3, "mechanics": ["TAUNT"], "races": ["BEAST"]},
+    {"dbfId": 1, "name": "Alpha", "cost": 1, "mechanics": ["TAUNT", "DEATHRATTLE"], "relatedCardDbfIds": [3]},
+    {"dbfId": 2, "name": "Beta", "cost": 2},
+    {"name": "No id"},
+]
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(CARDS), encoding="utf-8")
+    db = tmp_path / "cards.sqlite"
+    assert import_cards(src, db) == 3
+    return db
+
+
+def test_round_trip_keeps_records_and_source_order(store_path):
+    with CardStore.open(store_path) as store:
+        assert list(store) == [3, 1, 2]
+        assert store[1] == CARDS[1]
+        assert 2 in store and 99 not in store
+        assert store.all_cards() == CARDS[:3]
+        assert store.meta("source") == "cards.json"
+    assert ec.load_cards(str(store_path)) == CARDS[:3]
+
+
+def test_indexed_queries(store_path):
+    with CardStore.open(store_path) as store:
+        assert store.subset([2, 99, 2]) == {2: CARDS[2]}
+        assert store.ids_with_mechanic("TAUNT") == [1, 3]
+        assert store.ids_with_race("BEAST") == [3]
+        assert store.related_ids(1) == [3]
+
+
+def test_cli_extract_reads_only_requested_cards(store_path, tmp_path, capsys):
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({"sourceFile": str(store_path), "ids": [2, 3], "basic": True}), encoding="utf-8")
+
+    assert ec.main(["--config", str(cfg)]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert [c["name"] for c in out] == ["Beta", "Gamma"]
+
+
+def test_missing_or_outdated_store_is_reported(store_path, tmp_path):
+    with pytest.raises(ec.IOErrorEx):
+        CardStore.open(tmp_path / "missing.sqlite")
+    with sqlite3.connect(store_path) as con:
+        con.execute("UPDATE meta SET value = '0' WHERE key = 'schemaVersion'")
+    con.close()
+    with pytest.raises(ec.DataError):
+        CardStore.open(store_path)
+
+
+def test_store_is_opened_read_only_in_rollback_journal_mode(store_path):
+    # Rollback-journal mode (header bytes 18/19 == 1); WAL would need a writable directory.
+    assert store_path.read_bytes()[18:20] == b"\x01\x01"
+    with CardStore.open(store_path) as store:
+        with pytest.raises(sqlite3.OperationalError, match="readonly"):
+            store._con.execute("CREATE TABLE scratch (x)")
+
+
+@pytest.mark.skipif(not hasattr(os, "geteuid") or os.geteuid() == 0, reason="chmod does not restrict root")
+def test_store_opens_from_read_only_directory(store_path):
+    store_path.chmod(0o444)
+    store_path.parent.chmod(0o555)
+    try:
+        with CardStore.open(store_path) as store:
+            assert store[2] == CARDS[2]
+    finally:
+        store_path.parent.chmod(0o755)
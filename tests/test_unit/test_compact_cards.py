@@ -0,0 +1,59 @@
+import json
+
+import extract_cards as ec
+from compact_cards import CompactCard, CardCompactor
+
+
+CARD = {
+    "id": "CS3_007",
+    "dbfId": 62442,
+    "name": "Novice Zapper",
+    "set": "Core",
+    "cardClass": "SHAMAN",
+    "classes": ["SHAMAN"],
+    "type": "Minion",
+    "cost": 1,
+    "collectible": True,
+    "mechanics": ["OVERLOAD", "SPELLPOWER"],
+    "audio2": {"BASIC_play": {"Play": {"mainSounds": ["VO_CS3_007_Play_03.ogg"]}}},
+    "tags": {"TAG_SCRIPT_DATA_NUM_1": 3},
+}
+
+
+def test_compact_card_serializes_to_identical_json():
+    compact = CardCompactor().compact(CARD)
+
+    assert isinstance(compact, CompactCard)
+    assert json.dumps(compact.to_dict(), ensure_ascii=False) == json.dumps(CARD, ensure_ascii=False)
+    assert compact == CARD
+    assert list(compact) == list(CARD)
+
+
+def test_compact_card_reads_like_a_read_only_mapping():
+    compact = CardCompactor().compact(CARD)
+
+    assert compact.get("cost") == 1 and "health" not in compact
+    assert compact["mechanics"] == ("OVERLOAD", "SPELLPOWER")
+    # Packed side storage decodes into a fresh object each time
+    audio = compact["audio2"]
+    audio["mutated"] = True
+    assert "mutated" not in compact["audio2"]
+
+
+def test_compactor_shares_shapes_and_interned_strings():
+    compactor = CardCompactor()
+    a = compactor.compact(dict(CARD))
+    b = compactor.compact(json.loads(json.dumps(CARD)))  # distinct string objects
+
+    assert a._shape is b._shape
+    assert a["cardClass"] is b["cardClass"]
+
+
+def test_compact_source_extracts_same_entries(tmp_path):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps([CARD]), encoding="utf-8")
+
+    plain = ec.extract_entries(ec.build_card_index(ec.load_cards(src)), [62442])
+    compact = ec.extract_entries(ec.build_card_index(ec.load_cards(src, compact=True)), [62442])
+
+    assert compact == plain and type(compact[0]["mechanics"]) is list
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+import extract_cards as ec
+from curve_sim import curve, deck_costs, max_cost, mulligan_policy, simulate_deck, simulate_decks
+from draw_odds import prob_at_least_one
+
+COSTS = np.array([1] * 2 + [2] * 6 + [3] * 6 + [4] * 6 + [5] * 4 + [6] * 4 + [7] * 2)
+
+
+def test_same_seed_reproduces_regardless_of_workers():
+    a = simulate_deck(COSTS, games=6_000, seed=7, turns=4, chunk_size=2_000)
+    b = simulate_deck(COSTS, games=6_000, seed=7, turns=4, chunk_size=2_000, workers=2)
+    c = simulate_deck(COSTS, games=6_000, seed=8, turns=4, chunk_size=2_000)
+
+    assert a == b
+    assert a != c
+
+
+def test_keep_all_matches_exact_odds():
+    report = simulate_deck(COSTS, games=200_000, seed=1, turns=3)
+    exact = prob_at_least_one([2, 6, 6], 30, turns=3)[[0, 1, 2], [0, 1, 2]]
+
+    assert report["play"]["onCurve"] == pytest.approx(exact.tolist(), abs=0.01)
+    assert report["play"]["castable"][0] == report["play"]["onCurve"][0]
+
+
+def test_mulligan_policies_mark_cards_to_throw_back():
+    hand = np.array([[1, 5, 1, 2]])
+
+    assert max_cost(hand, limit=2).tolist() == [[False, True, False, False]]
+    assert curve(hand).tolist() == [[False, True, True, False]]
+    assert mulligan_policy({"policy": "max_cost", "maxCost": 1})(hand).tolist() == [[False, True, False, True]]
+    with pytest.raises(ec.ConfigError):
+        mulligan_policy("nope")
+
+
+def test_mulligan_raises_early_curve_hits():
+    kept = simulate_deck(COSTS, games=50_000, seed=2, turns=2)
+    mulled = simulate_deck(COSTS, games=50_000, seed=2, turns=2, policy="curve")
+
+    assert mulled["coin"]["onCurve"][1] > kept["coin"]["onCurve"][1]
+
+
+def test_deck_costs_expands_counts_and_requires_cost():
+    by_id = {1: {"cost": 1}, 2: {"cost": 4}, 3: {"name": "No cost"}}
+
+    assert sorted(deck_costs({1: 2, 2: 1}, by_id).tolist()) == [1, 1, 4]
+    with pytest.raises(ec.DataError):
+        deck_costs({3: 1}, by_id)
+    with pytest.raises(ec.DataError):
+        simulate_decks([np.array([1, 2, 3])], games=10)
+
+
+@pytest.mark.parametrize("kwargs", [{"games": 0}, {"games": -5}, {"chunk_size": 0}, {"games": 10, "chunk_size": -1}])
+def test_rejects_non_positive_games_and_chunk_size(kwargs):
+    with pytest.raises(ec.ConfigError):
+        simulate_decks([COSTS], **kwargs)
@@ -0,0 +1,111 @@
+import json
+
+from hearthstone.deckstrings import parse_deckstring, write_deckstring
+from hearthstone.enums import FormatType
+
+import extract_cards as ec
+from deck_fingerprint import DEFAULT_HERO_DBF_IDS, DeckDeduper, canonical_deckstring, deck_fingerprint
+
+CARDS = [
+    {"dbfId": 10, "name": "Mage Spell", "cardClass": "MAGE"},
+    {"dbfId": 20, "name": "Neutral Minion", "cardClass": "NEUTRAL"},
+    {"dbfId": 40, "name": "Zerg Minion", "classes": ["DEATHKNIGHT", "DEMONHUNTER", "HUNTER", "WARLOCK"]},
+]
+LIST = [(10, 2), (20, 1)]
+# Same decklist: different hero skin, format byte and card order.
+VARIANTS = [
+    write_deckstring(LIST, [637], FormatType.FT_STANDARD),
+    write_deckstring(LIST[::-1], [39117], FormatType.FT_WILD),
+    write_deckstring(LIST, [637], FormatType.FT_WILD),
+]
+OTHER = write_deckstring([(10, 1), (20, 2)], [637], FormatType.FT_STANDARD)
+
+
+def test_fingerprint_ignores_order_but_not_counts():
+    assert deck_fingerprint([10, 20, 10]) == deck_fingerprint([20, 10, 10])
+    assert deck_fingerprint([10, 20, 10]) != deck_fingerprint([10, 20, 20])
+    assert len({deck_fingerprint(ec.decode_deck_code_real(c)) for c in VARIANTS}) == 1
+
+
+def test_canonical_deckstring_normalizes_hero_format_and_order():
+    by_id = ec.build_card_index(CARDS)
+    canonical = {canonical_deckstring(c, by_id) for c in VARIANTS}
+
+    assert len(canonical) == 1
+    cards, heroes, fmt, _ = parse_deckstring(canonical.pop())
+    assert cards == LIST and heroes == [DEFAULT_HERO_DBF_IDS["MAGE"]] and fmt == FormatType.FT_WILD
+    assert parse_deckstring(canonical_deckstring(VARIANTS[1]))[1] == [39117]
+
+
+def test_deduper_counts_occurrences_in_first_seen_order():
+    report = DeckDeduper().add_all([OTHER, *VARIANTS, "not-a-code", VARIANTS[0]]).report()
+
+    assert (report["decks"], report["uniqueDecks"], report["invalidDecks"]) == (5, 2, 1)
+    assert [(d["deckCode"], d["count"]) for d in report["unique"]] == [(VARIANTS[0], 4), (OTHER, 1)]
+
+
+def test_cli_dedupe_mode_with_canonical_codes(tmp_path, capsys):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(CARDS), encoding="utf-8")
+    codes = tmp_path / "decks.txt"
+    codes.write_text("\n".join(VARIANTS + [OTHER]), encoding="utf-8")
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({
+        "sourceFile": str(src), "mode": "dedupe", "deckCodesFile": str(codes), "canonical": True,
+    }), encoding="utf-8")
+
+    assert ec.main(["--config", str(cfg)]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["uniqueDecks"] == 2
+    assert report["unique"][0]["deckCode"] == canonical_deckstring(VARIANTS[1], ec.build_card_index(CARDS))
+
+
+def test_decks_differing_only_in_sideboard_stay_distinct():
+    # Same main deck with E.T.C. (90749), different cards in its sideboard.
+    main = [(10, 2), (90749, 1)]
+    band_a = write_deckstring(main, [637], FormatType.FT_WILD, [(20, 1, 90749)])
+    band_b = write_deckstring(main, [637], FormatType.FT_WILD, [(30, 1, 90749)])
+    band_a_again = write_deckstring(main[::-1], [637], FormatType.FT_STANDARD, [(20, 1, 90749)])
+
+    report = DeckDeduper(canonical=True).add_all([band_a, band_b, band_a_again]).report()
+
+    assert report["uniqueDecks"] == 2
+    assert [(parse_deckstring(d["deckCode"])[3], d["count"]) for d in report["unique"]] == [
+        ([(20, 1, 90749)], 2), ([(30, 1, 90749)], 1),
+    ]
+    assert deck_fingerprint([10, 10], [(20, 1, 90749)]) != deck_fingerprint([10, 10], [(30, 1, 90749)])
+
+
+def test_canonical_hero_follows_the_encoded_hero_class():
+    by_id = ec.build_card_index(CARDS)
+    # Zerg cards alone vote DEATHKNIGHT (ties by name); the Hunter hero decides.
+    hunter = write_deckstring([(40, 2)], [DEFAULT_HERO_DBF_IDS["HUNTER"]], FormatType.FT_STANDARD)
+    unknown_hero = write_deckstring([(40, 2)], [123456], FormatType.FT_STANDARD)
+
+    assert parse_deckstring(canonical_deckstring(hunter, by_id))[1] == [DEFAULT_HERO_DBF_IDS["HUNTER"]]
+    assert parse_deckstring(canonical_deckstring(unknown_hero, by_id))[1] == [DEFAULT_HERO_DBF_IDS["DEATHKNIGHT"]]
+    death_knight = write_deckstring([(40, 2)], [DEFAULT_HERO_DBF_IDS["DEATHKNIGHT"]], FormatType.FT_STANDARD)
+    report = DeckDeduper(by_id=by_id).add_all([hunter, death_knight, unknown_hero]).report()
+    assert [(d["deckCode"], d["count"]) for d in report["unique"]] == [(death_knight, 2), (hunter, 1)]
+
+
+def test_cli_dedupe_goes_through_the_deck_parser_seam(tmp_path, capsys, monkeypatch):
+    decks = {"A": [1, 1, 2], "A2": [2, 1, 1], "B": [1, 2, 2]}
+
+    def fake_parser(code: str) -> ec.ParsedDeck:
+        if code not in decks:
+            raise ec.DeckCodeError("invalid code")
+        return ec.ParsedDeck(decks[code], None, [])
+
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(CARDS), encoding="utf-8")
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({
+        "sourceFile": str(src), "mode": "dedupe", "deckCodes": ["A", "B", "A2", "???"],
+    }), encoding="utf-8")
+    monkeypatch.setattr(ec, "DECK_PARSER", fake_parser)
+
+    assert ec.main(["--config", str(cfg)]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert (report["uniqueDecks"], report["invalidDecks"]) == (2, 1)
+    assert [(d["deckCode"], d["count"]) for d in report["unique"]] == [("A", 2), ("B", 1)]
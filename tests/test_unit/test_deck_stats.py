@@ -0,0 +1,61 @@
+import json
+
+import extract_cards as ec
+from deck_stats import columnar_stats, deck_stats
+
+CARDS = [
+    {"dbfId": 1, "name": "Raptor", "cost": 1, "type": "Minion", "attack": 2, "health": 1,
+     "races": ["BEAST", "DRAGON"], "mechanics": ["RUSH"]},
+    {"dbfId": 2, "name": "Fireball", "cost": 4, "type": "Spell", "spellSchool": "FIRE", "mechanics": []},
+    {"dbfId": 3, "name": "Colossus", "cost": 9, "type": "Minion", "attack": 8, "health": 8, "race": "ELEMENTAL",
+     "mechanics": ["TAUNT", "RUSH"]},
+]
+
+
+def fake_decoder(code: str) -> list[int]:
+    return {"DECK-A": [1, 1, 2, 3], "DECK-B": [2, 2, 3]}[code]
+
+
+def test_single_deck_stats_are_weighted_by_copies():
+    stats = deck_stats(CARDS, [2, 1, 1])
+
+    assert stats["cards"] == 4
+    assert stats["curve"] == {"0": 0, "1": 2, "2": 0, "3": 0, "4": 1, "5": 0, "6": 0, "7+": 1}
+    assert stats["types"] == {"Minion": 3, "Spell": 1}
+    assert stats["spellSchools"] == {"FIRE": 1}
+    assert stats["races"] == {"BEAST": 2, "DRAGON": 2, "ELEMENTAL": 1}
+    assert stats["mechanics"] == {"RUSH": 3, "TAUNT": 1}
+    assert stats["totals"] == {"attack": 12, "health": 10}
+
+
+def test_columnar_stats_match_per_deck_stats():
+    decks = [[[0, 2], [1, 1], [2, 1]], [], [[1, 2], [2, 1]]]
+    stats = columnar_stats(CARDS, decks)
+
+    assert stats["cards"] == [4, 0, 3]
+    types = dict(zip(stats["types"]["labels"], zip(*stats["types"]["values"])))
+    assert types == {"Minion": (3, 0, 1), "Spell": (1, 0, 2)}
+    assert stats["totals"]["attack"] == [12, 0, 8]
+    assert dict(zip(stats["curve"]["labels"], stats["curve"]["values"][2])) == deck_stats(CARDS[1:], [2, 1])["curve"]
+
+
+def test_cli_extract_and_batch_stats(tmp_path, capsys, monkeypatch):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(CARDS), encoding="utf-8")
+    monkeypatch.setattr(ec, "DECK_DECODER", fake_decoder)
+    monkeypatch.setattr(ec, "MULTIPLICITY_RESOLVER", ec.make_multiplicity_resolver(fake_decoder))
+    cfg = tmp_path / "cfg.json"
+
+    cfg.write_text(json.dumps({"sourceFile": str(src), "deckCode": "DECK-A", "basic": True, "stats": True}),
+                   encoding="utf-8")
+    assert ec.main(["--config", str(cfg)]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert [c["countFromDeck"] for c in out["cards"]] == [2, 1, 1]
+    assert out["stats"]["mechanics"] == {"RUSH": 3, "TAUNT": 1}
+
+    cfg.write_text(json.dumps({"sourceFile": str(src), "mode": "batch", "deckCodes": ["DECK-A", "DECK-B"],
+                               "basic": True, "stats": True}), encoding="utf-8")
+    assert ec.main(["--config", str(cfg)]) == 0
+    doc = json.loads(capsys.readouterr().out)
+    assert doc["stats"]["cards"] == [4, 3]
+    assert doc["stats"]["totals"]["health"] == [10, 8]
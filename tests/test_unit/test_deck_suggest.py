@@ -0,0 +1,94 @@
+import json
+
+import pytest
+
+import extract_cards as ec
+from deck_suggest import SuggestionModel
+
+
+def _card(dbf_id, cost, klass="NEUTRAL", mechanics=(), rarity="Common", collectible=True, **extra):
+    return {"dbfId": dbf_id, "name": f"Card {dbf_id}", "cost": cost, "cardClass": klass, "classes": [klass],
+            "mechanics": list(mechanics), "rarity": rarity, "collectible": collectible, **extra}
+
+
+CARDS = [
+    _card(1, 1, "MAGE", ["TAUNT"]),
+    _card(2, 2, "MAGE", ["TAUNT"]),
+    _card(3, 5, "NEUTRAL", ["TAUNT"]),
+    _card(4, 5, "NEUTRAL", ["RUSH"]),
+    _card(5, 1, "ROGUE", ["TAUNT"]),
+    _card(6, 1, "NEUTRAL", ["TAUNT"], collectible=False),
+    _card(7, 6, "MAGE", ["TAUNT"], rarity="Legendary"),
+    _card(8, 3, "NEUTRAL", referencedTags=["TAUNT"]),
+]
+
+
+def test_only_legal_candidates_are_ranked():
+    result = SuggestionModel(CARDS).suggest([1, 2, 2, 7], k=10)
+
+    assert result["deck"] == {"class": "MAGE", "size": 4, "missing": 26}
+    ids = [s["dbfId"] for s in result["suggestions"]]
+    assert 5 not in ids and 6 not in ids  # off-class, not collectible
+    assert 2 not in ids and 7 not in ids  # no copies left
+    assert {s["dbfId"]: s["copiesLeft"] for s in result["suggestions"]}[1] == 1
+
+
+def test_class_comes_from_the_hero_and_unknown_class_gets_neutrals_only(tmp_path, capsys, monkeypatch):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(CARDS), encoding="utf-8")
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({"sourceFile": str(src), "mode": "suggest", "deckCode": "NEUTRALS"}), encoding="utf-8")
+    # Neutral 2-ofs only: no card votes for a class, the Mage hero decides.
+    monkeypatch.setattr(ec, "DECK_PARSER", lambda _s: ec.ParsedDeck([3, 3, 4, 4], 637, []))
+
+    assert ec.main(["--config", str(cfg)]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert result["deck"]["class"] == "MAGE"
+    assert {s["dbfId"] for s in result["suggestions"]} == {1, 2, 7, 8}
+
+    unknown = SuggestionModel(CARDS).suggest([3, 3, 4, 4])
+    assert unknown["deck"]["class"] == "NEUTRAL"
+    assert [s["dbfId"] for s in unknown["suggestions"]] == [8]
+
+
+def test_breakdown_components_drive_the_ranking():
+    model = SuggestionModel(CARDS)
+
+    by_synergy = model.suggest([1, 2], k=3, weights={"curve": 0.0})["suggestions"]
+    assert by_synergy[0]["dbfId"] == 8  # wants TAUNT, which the deck provides
+    assert by_synergy[0]["breakdown"]["synergy"] == 1.0
+
+    by_curve = model.suggest([1, 1, 2, 2], k=1, weights={"synergy": 0.0})["suggestions"]
+    assert by_curve[0]["cost"] in (3, 5) and by_curve[0]["breakdown"]["curve"] == 1.0
+
+    by_meta = model.suggest([1], k=1, inclusion={4: 0.9}, weights={"curve": 0.0, "synergy": 0.0})
+    assert by_meta["suggestions"][0]["dbfId"] == 4
+    with pytest.raises(ec.ConfigError):
+        model.suggest([1], weights={"hype": 1.0})
+    for bad in ({"curve": "x"}, {"meta": True}, ["curve"]):
+        with pytest.raises(ec.ConfigError):
+            model.suggest([1], weights=bad)
+
+
+def test_cli_suggest_mode(tmp_path, capsys):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(CARDS), encoding="utf-8")
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({"sourceFile": str(src), "mode": "suggest", "ids": [1, 2], "suggest": {"topK": 2}}),
+                   encoding="utf-8")
+
+    assert ec.main(["--config", str(cfg)]) == 0
+    result = json.loads(capsys.readouterr().out)
+    assert len(result["suggestions"]) == 2 and result["deck"]["class"] == "MAGE"
+
+
+@pytest.mark.parametrize("top_k", [0, -1, "5", True, 2.5])
+def test_cli_rejects_invalid_top_k(tmp_path, capsys, top_k):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(CARDS), encoding="utf-8")
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({"sourceFile": str(src), "mode": "suggest", "ids": [1], "suggest": {"topK": top_k}}),
+                   encoding="utf-8")
+
+    assert ec.main(["--config", str(cfg)]) == 2
+    assert "'topK' must be a positive integer." in capsys.readouterr().err
@@ -0,0 +1,100 @@
+import json
+
+from hearthstone.deckstrings import write_deckstring
+from hearthstone.enums import FormatType
+
+import extract_cards as ec
+from deck_validation import LegalityIndex, summarize, validate_deck_codes
+
+CARDS = [
+    {"dbfId": 1, "name": "Mage Spell", "cardClass": "MAGE", "rarity": "Common", "collectible": True, "set": "CORE"},
+    {"dbfId": 2, "name": "Mage Legend", "cardClass": "MAGE", "rarity": "Legendary", "collectible": True, "set": "CORE"},
+    {"dbfId": 3, "name": "Neutral", "cardClass": "NEUTRAL", "rarity": "Rare", "collectible": True, "set": "OLD"},
+    {"dbfId": 4, "name": "Rogue Blade", "cardClass": "ROGUE", "rarity": "Common", "collectible": True, "set": "CORE"},
+    {"dbfId": 5, "name": "Token", "cardClass": "MAGE", "rarity": "Common", "collectible": False, "set": "CORE"},
+]
+DECKS = {
+    "GOOD": [1, 1, 2, 3, 3],
+    "BAD": [1, 1, 1, 2, 2, 4, 5, 99],
+}
+
+
+def fake_parser(code: str) -> ec.ParsedDeck:
+    if code not in DECKS:
+        raise ec.DeckCodeError("invalid code")
+    return ec.ParsedDeck(DECKS[code], None, [])
+
+
+def test_reports_every_rule_violation():
+    index = LegalityIndex(CARDS, deck_size=5)
+
+    assert index.validate(DECKS["GOOD"]) == {"class": "MAGE", "size": 5, "valid": True, "errors": []}
+    report = index.validate(DECKS["BAD"])
+    assert report["class"] == "MAGE" and not report["valid"]
+    assert report["errors"] == [
+        {"code": "deckSize", "size": 8, "expected": 5},
+        {"code": "tooManyCopies", "dbfId": 1, "count": 3, "limit": 2},
+        {"code": "tooManyCopies", "dbfId": 2, "count": 2, "limit": 1},
+        {"code": "offClass", "dbfId": 4, "classes": ["ROGUE"]},
+        {"code": "notCollectible", "dbfId": 5},
+        {"code": "unknownCard", "dbfId": 99},
+    ]
+
+
+def test_legal_sets_restrict_the_format():
+    index = LegalityIndex(CARDS, legal_sets=["CORE"], deck_size=5)
+
+    assert index.validate(DECKS["GOOD"])["errors"] == [{"code": "notInFormat", "dbfId": 3, "set": "OLD"}]
+
+
+def test_legal_sets_ignore_case():
+    cards = [{**c, "set": c["set"].capitalize()} for c in CARDS]
+
+    assert LegalityIndex(cards, legal_sets=["core", "OLD"], deck_size=5).validate(DECKS["GOOD"])["valid"]
+
+
+def test_class_comes_from_the_hero_before_the_card_vote():
+    index = LegalityIndex(CARDS, deck_size=3)
+    mage_hero = write_deckstring([(4, 2), (1, 1)], [637], FormatType.FT_WILD)
+    skin = write_deckstring([(4, 2), (1, 1)], [123456], FormatType.FT_WILD)
+
+    mage, voted = validate_deck_codes([mage_hero, skin], index)
+    assert mage["class"] == "MAGE"
+    assert mage["errors"] == [{"code": "offClass", "dbfId": 4, "classes": ["ROGUE"]}]
+    assert voted["class"] == "ROGUE"
+    assert voted["errors"] == [{"code": "offClass", "dbfId": 1, "classes": ["MAGE"]}]
+
+
+def test_tourist_cards_are_playable_in_the_class_they_visit():
+    tourist = {"dbfId": 6, "name": "Aranna, Thrill Seeker", "cardClass": "DEMONHUNTER", "touristFor": ["PRIEST"],
+               "rarity": "Legendary", "collectible": True, "set": "CORE"}
+    index = LegalityIndex(CARDS + [tourist], deck_size=2)
+    priest = write_deckstring([(3, 1), (6, 1)], [813], FormatType.FT_WILD)
+
+    assert next(validate_deck_codes([priest], index)) == {
+        "deckCode": priest, "class": "PRIEST", "size": 2, "valid": True, "errors": [],
+    }
+    assert index.validate([1, 6], "MAGE")["errors"] == [{"code": "offClass", "dbfId": 6, "classes": ["DEMONHUNTER", "PRIEST"]}]
+
+
+def test_bulk_summary_counts_decks_per_error():
+    reports = validate_deck_codes(["GOOD", "BAD", "???"], LegalityIndex(CARDS, deck_size=5), fake_parser)
+    summary = summarize(reports, invalid_only=True)
+
+    assert (summary["decks"], summary["validDecks"], summary["invalidDecks"]) == (3, 1, 2)
+    assert summary["errorCounts"]["tooManyCopies"] == 1 and summary["errorCounts"]["decode"] == 1
+    assert [r["deckCode"] for r in summary["results"]] == ["BAD", "???"]
+
+
+def test_cli_validate_mode(tmp_path, capsys, monkeypatch):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(CARDS), encoding="utf-8")
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({
+        "sourceFile": str(src), "mode": "validate", "deckCodes": ["GOOD", "BAD"], "deckSize": 5,
+    }), encoding="utf-8")
+    monkeypatch.setattr(ec, "DECK_PARSER", fake_parser)
+
+    assert ec.main(["--config", str(cfg)]) == 0
+    summary = json.loads(capsys.readouterr().out)
+    assert [r["valid"] for r in summary["results"]] == [True, False]
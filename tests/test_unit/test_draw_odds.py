@@ -0,0 +1,146 @@
+import json
+from math import comb
+
+import numpy as np
+import pytest
+
+import extract_cards as ec
+from draw_odds import group_draw_odds, prob_at_least_k, prob_at_least_one
+
+
+def _p_hit(deck: int, copies: int, seen: int) -> float:
+    return 1 - comb(deck - copies, seen) / comb(deck, seen)
+
+
+@pytest.mark.parametrize("hand", [3, 4])
+def test_prob_at_least_one_matches_hypergeometric(hand):
+    out = prob_at_least_one([1, 2], 30, turns=5, hand=hand)
+
+    assert out.shape == (2, 5)
+    for row, copies in enumerate([1, 2]):
+        expected = [_p_hit(30, copies, hand + t) for t in range(1, 6)]
+        assert np.allclose(out[row], expected)
+
+
+def test_hard_mulligan_improves_odds_and_matches_closed_form():
+    plain = prob_at_least_one([2], 30, turns=3)
+    mull = prob_at_least_one([2], 30, turns=3, mulligan=True)
+
+    miss_t1 = (comb(28, 3) / comb(30, 3)) * (comb(25, 3) / comb(27, 3)) * (comb(25, 1) / comb(27, 1))
+    assert mull[0, 0] == pytest.approx(1 - miss_t1)
+    assert np.all(mull > plain)
+
+
+def test_group_odds_at_least_k():
+    # Three 2-of one-drops: group of 6 cards
+    out = prob_at_least_k([6], [2], 30, turns=1)
+    expected = sum(comb(6, i) * comb(24, 4 - i) for i in range(2, 5)) / comb(30, 4)
+    assert out[0, 0] == pytest.approx(expected)
+
+    named = group_draw_odds({"1-drops": [2, 2, 2]}, 30, turns=2)
+    assert named["1-drops"]["coin"][0] >= named["1-drops"]["play"][0]
+
+
+def test_more_cards_seen_than_deck_size_is_certain():
+    assert np.all(prob_at_least_one([1], 3, turns=4) == 1.0)
+
+
+def test_cli_adds_draw_odds_section(tmp_path, capsys, monkeypatch):
+    cards = [{"dbfId": i, "name": f"Card{i}", "cost": i} for i in range(1, 16)]
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(cards), encoding="utf-8")
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(
+        json.dumps({"sourceFile": str(src), "deckCode": "FAKE", "basic": True, "drawOdds": {"turns": 3}}),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(ec, "DECK_DECODER", lambda _s: [i for i in range(1, 16) for _ in range(2)])
+
+    assert ec.main(["--config", str(cfg)]) == 0
+    entries = json.loads(capsys.readouterr().out)
+    odds = entries[0]["drawOdds"]
+    assert entries[0]["countFromDeck"] == 2
+    assert odds["play"] == pytest.approx([round(_p_hit(30, 2, 3 + t), 4) for t in (1, 2, 3)])
+    assert len(odds["coin"]) == 3
+
+
+def test_batch_odds_use_decoded_deck_size_and_groups(tmp_path, capsys, monkeypatch):
+    # Only two of the fifteen decoded cards are in the dump; the rest still take up draws.
+    cards = [{"dbfId": 1, "name": "One", "cost": 1}, {"dbfId": 2, "name": "Two", "cost": 2}]
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(cards), encoding="utf-8")
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({
+        "sourceFile": str(src), "mode": "batch", "deckCodes": ["FAKE"],
+        "drawOdds": {"turns": 2, "groups": "curve"},
+    }), encoding="utf-8")
+    monkeypatch.setattr(ec, "DECK_DECODER", lambda _s: [i for i in range(1, 16) for _ in range(2)])
+
+    assert ec.main(["--config", str(cfg)]) == 0
+    deck = json.loads(capsys.readouterr().out)["decks"][0]
+    assert deck["deckSize"] == 30
+    assert deck["drawOdds"][0]["play"] == pytest.approx([round(_p_hit(30, 2, 3 + t), 4) for t in (1, 2)])
+    assert list(deck["drawOddsGroups"]) == ["1", "2"]
+    assert deck["drawOddsGroups"]["1"] == deck["drawOdds"][0]
+
+
+def test_cli_group_odds_next_to_cards(tmp_path, capsys, monkeypatch):
+    cards = [{"dbfId": i, "name": f"Card{i}", "cost": 1 if i <= 2 else 3} for i in range(1, 16)]
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(cards), encoding="utf-8")
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({
+        "sourceFile": str(src), "deckCode": "FAKE", "drawOdds": {"turns": 3, "groups": "curve"},
+    }), encoding="utf-8")
+    monkeypatch.setattr(ec, "DECK_DECODER", lambda _s: [i for i in range(1, 16) for _ in range(2)])
+
+    assert ec.main(["--config", str(cfg)]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert len(out["cards"]) == 15 and "drawOdds" in out["cards"][0]
+    assert out["drawOddsGroups"]["1"]["play"] == pytest.approx([round(_p_hit(30, 4, 3 + t), 4) for t in (1, 2, 3)])
+    assert out["drawOddsGroups"]["3"]["play"][0] == 1.0
+
+
+def test_group_odds_ignore_extra_ids_outside_the_deck(tmp_path, capsys, monkeypatch):
+    cards = [{"dbfId": i, "name": f"Card{i}", "cost": 1 if i in (1, 99) else 3} for i in [*range(1, 16), 99]]
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(cards), encoding="utf-8")
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({
+        "sourceFile": str(src), "deckCode": "FAKE", "ids": [99], "drawOdds": {"turns": 1, "groups": "curve"},
+    }), encoding="utf-8")
+    calls = []
+    monkeypatch.setattr(ec, "DECK_DECODER", lambda s: calls.append(s) or [i for i in range(1, 16) for _ in range(2)])
+    monkeypatch.setattr(ec, "MULTIPLICITY_RESOLVER", ec.make_multiplicity_resolver(lambda _s: [i for i in range(1, 16) for _ in range(2)]))
+
+    assert ec.main(["--config", str(cfg)]) == 0
+    out = json.loads(capsys.readouterr().out)
+    # Card 99 is extracted but not in the deck: the 1-drop group is card 1's two copies only.
+    assert "countFromDeck" not in out["cards"][-1]
+    assert out["drawOddsGroups"]["1"]["play"] == [round(_p_hit(30, 2, 4), 4)]
+    assert calls == ["FAKE"]
+
+
+@pytest.mark.parametrize("mulligan", ["no", 1, None])
+def test_mulligan_must_be_a_bool(tmp_path, capsys, monkeypatch, mulligan):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps([{"dbfId": 1, "name": "One"}]), encoding="utf-8")
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({"sourceFile": str(src), "deckCode": "FAKE", "drawOdds": {"mulligan": mulligan}}),
+                   encoding="utf-8")
+    monkeypatch.setattr(ec, "DECK_DECODER", lambda _s: [1, 1])
+
+    assert ec.main(["--config", str(cfg)]) == 2
+    assert "'drawOdds.mulligan' must be true or false." in capsys.readouterr().err
+
+
+def test_unknown_group_category_is_a_config_error(tmp_path, capsys, monkeypatch):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps([{"dbfId": 1, "name": "One"}]), encoding="utf-8")
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({"sourceFile": str(src), "deckCode": "FAKE", "drawOdds": {"groups": "cost"}}),
+                   encoding="utf-8")
+    monkeypatch.setattr(ec, "DECK_DECODER", lambda _s: [1, 1])
+
+    assert ec.main(["--config", str(cfg)]) == 2
+    assert "'drawOdds.groups' must be one of" in capsys.readouterr().err
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+import extract_cards as ec
+from card_repository import CardRepository
+from locales import LocaleCatalog, build_overlay, load_overlay, main as locales_main, overlay_path
+
+BASE = [
+    {"dbfId": 1, "name": "Fireball", "text": "Deal 6 damage.", "flavor": "Hot.", "cost": 4},
+    {"dbfId": 2, "name": "Wisp", "text": "", "cost": 0, "attack": 1, "health": 1},
+]
+GERMAN = [
+    {"dbfId": 1, "name": "Feuerball", "text": "Verursacht 6 Schaden.", "flavor": "Heiß.", "cost": 4},
+    {"dbfId": 2, "name": "Irrwisch", "text": "", "cost": 0},
+    {"dbfId": 99, "name": "Nicht im Basis-Dump"},
+]
+
+
+@pytest.fixture
+def source(tmp_path):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(BASE), encoding="utf-8")
+    overlay_path(src, "deDE").write_text(json.dumps(build_overlay(BASE, GERMAN, "deDE")), encoding="utf-8")
+    return src
+
+
+def test_overlay_keeps_only_changed_strings():
+    overlay = build_overlay(BASE, GERMAN, "deDE")
+
+    assert overlay["strings"] == {
+        "1": {"name": "Feuerball", "text": "Verursacht 6 Schaden.", "flavor": "Heiß."},
+        "2": {"name": "Irrwisch"},
+    }
+    all_locales = [{"dbfId": 1, "name": {"enUS": "Fireball", "frFR": "Boule de feu"}}]
+    assert build_overlay(BASE, all_locales, "frFR")["strings"] == {"1": {"name": "Boule de feu"}}
+
+
+def test_catalog_loads_locales_lazily_and_shares_base_records(source):
+    by_id = ec.build_card_index(BASE)
+    catalog = LocaleCatalog(by_id, source)
+    assert catalog.loaded_locales == []
+
+    german = catalog.index("deDE")
+    assert catalog.loaded_locales == ["deDE"]
+    assert catalog.index("deDE") is german
+    assert german[1]["name"] == "Feuerball" and german[1]["cost"] == 4
+    assert german[2]["attack"] == 1
+    assert ec.as_plain_dict(german[1]) == {**BASE[0], **load_overlay(overlay_path(source, "deDE"))[1]}
+    assert catalog.index(None) is by_id
+    with pytest.raises(ec.IOErrorEx):
+        catalog.index("frFR")
+    with pytest.raises(ec.ConfigError):
+        catalog.index("german")
+
+
+def test_cli_and_repository_extract_in_locale(source, tmp_path, capsys):
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({"sourceFile": str(source), "ids": [1, 2], "basic": True, "locale": "deDE"}), encoding="utf-8")
+
+    assert ec.main(["--config", str(cfg)]) == 0
+    assert [c["name"] for c in json.loads(capsys.readouterr().out)] == ["Feuerball", "Irrwisch"]
+
+    repo = CardRepository.load(source)
+    assert repo.extract([1], locale="deDE")[0]["text"] == "Verursacht 6 Schaden."
+    assert repo.extract([1])[0]["text"] == "Deal 6 damage."
+    assert repo.get(2, locale="deDE")["name"] == "Irrwisch"
+
+
+def test_overlay_tool_writes_default_path(source, tmp_path):
+    dump = tmp_path / "german_full.json"
+    dump.write_text(json.dumps(GERMAN), encoding="utf-8")
+    overlay_path(source, "deDE").unlink()
+
+    assert locales_main(["--base", str(source), "--dump", str(dump), "--locale", "deDE"]) == 0
+    assert load_overlay(overlay_path(source, "deDE"), "deDE")[2] == {"name": "Irrwisch"}
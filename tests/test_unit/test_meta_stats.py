@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+import extract_cards as ec
+from meta_stats import MetaAggregate, aggregate_deck_codes
+
+CARDS = [
+    {"dbfId": 10, "name": "Mage Spell", "cardClass": "MAGE", "classes": ["MAGE"]},
+    {"dbfId": 20, "name": "Rogue Blade", "cardClass": "ROGUE", "classes": ["ROGUE"]},
+    {"dbfId": 30, "name": "Neutral Drop", "cardClass": "NEUTRAL", "classes": ["NEUTRAL"]},
+    {"dbfId": 40, "name": "Dual Card", "classes": ["MAGE", "ROGUE"]},
+]
+
+DECKS = {
+    "MAGE-1": [10, 10, 30, 40],
+    "MAGE-2": [10, 30, 30],
+    "ROGUE-1": [20, 20, 30, 40, 999],
+}
+
+
+HEROES = {"DUAL-MAGE": 637, "DUAL-ROGUE": 930, "DUAL-SKIN": 123456}
+
+
+def fake_parser(code: str) -> ec.ParsedDeck:
+    if code in HEROES:
+        return ec.ParsedDeck([40, 40, 30], HEROES[code], [])
+    if code not in DECKS:
+        raise ec.DeckCodeError("invalid code")
+    return ec.ParsedDeck(DECKS[code], None, [])
+
+
+def test_inclusion_and_copies_by_class():
+    agg = MetaAggregate(CARDS).add_deck_codes(["MAGE-1", "MAGE-2", "ROGUE-1", "BAD"], fake_parser, chunk_size=2)
+    report = agg.report(ec.build_card_index(CARDS))
+
+    assert report["decks"] == 3 and report["invalidDecks"] == 1 and report["unknownCopies"] == 1
+    assert report["decksByClass"] == {"MAGE": 2, "ROGUE": 1}
+    by_id = {c["dbfId"]: c for c in report["cards"]}
+    neutral = by_id[30]
+    assert neutral["name"] == "Neutral Drop"
+    assert neutral["inclusionRate"] == 1.0
+    assert neutral["avgCopies"] == pytest.approx(4 / 3, abs=1e-4)
+    assert neutral["byClass"]["MAGE"] == {"inclusionRate": 1.0, "avgCopies": 1.5}
+    assert by_id[10]["byClass"] == {"MAGE": {"inclusionRate": 1.0, "avgCopies": 1.5}}
+    assert set(by_id[40]["byClass"]) == {"MAGE", "ROGUE"}
+    assert report["cards"][0]["dbfId"] == 30
+
+
+def test_merged_partials_equal_single_pass():
+    whole = MetaAggregate(CARDS).add_deck_codes(list(DECKS), fake_parser)
+    part_a = MetaAggregate(CARDS).add_deck_codes(["MAGE-1"], fake_parser)
+    part_b = MetaAggregate(CARDS).add_deck_codes(["MAGE-2", "ROGUE-1"], fake_parser)
+
+    assert part_a.merge(part_b).report() == whole.report()
+    with pytest.raises(ec.DataError):
+        whole.merge(MetaAggregate(CARDS[:2]))
+
+
+def test_dual_class_decks_follow_the_hero():
+    agg = MetaAggregate(CARDS).add_deck_codes(list(HEROES), fake_parser)
+
+    # Only the hero-less deck falls back to the vote, whose tie goes to MAGE by name.
+    assert agg.report()["decksByClass"] == {"MAGE": 2, "ROGUE": 1}
+    assert agg.inclusion_rates("ROGUE") == {30: 1.0, 40: 1.0}
+
+
+def test_process_pool_matches_inline():
+    codes = (list(DECKS) + list(HEROES)) * 5
+    inline = aggregate_deck_codes(codes, CARDS, fake_parser, workers=1, chunk_size=4)
+    pooled = aggregate_deck_codes(codes, CARDS, fake_parser, workers=2, chunk_size=4)
+
+    assert pooled.report() == inline.report()
+
+
+def test_cli_meta_mode(tmp_path, capsys, monkeypatch):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(CARDS), encoding="utf-8")
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({"sourceFile": str(src), "mode": "meta", "deckCodes": list(DECKS)}), encoding="utf-8")
+    monkeypatch.setattr(ec, "DECK_PARSER", fake_parser)
+
+    assert ec.main(["--config", str(cfg)]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["decks"] == 3
+
+
+@pytest.mark.parametrize("workers", [0, -2, "4", True])
+def test_cli_rejects_invalid_workers(tmp_path, capsys, workers):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(CARDS), encoding="utf-8")
+    cfg = tmp_path / "cfg.json"
+    cfg.write_text(json.dumps({"sourceFile": str(src), "mode": "meta", "deckCodes": list(DECKS), "workers": workers}),
+                   encoding="utf-8")
+
+    assert ec.main(["--config", str(cfg)]) == 2
+    assert "'workers' must be a positive integer or null." in capsys.readouterr().err
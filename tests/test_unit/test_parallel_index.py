@@ -0,0 +1,71 @@
+import json
+
+import pytest
+
+import extract_cards as ec
+import parallel_index as pi
+
+CARDS = [
+    {"dbfId": i, "name": f"Card {i}", "text": "}, {", "counterpartCards": [{"dbfId": i + 1}, {"dbfId": i + 2}]}
+    for i in range(1, 41)
+]
+
+
+@pytest.fixture(autouse=True)
+def always_parallel(monkeypatch):
+    monkeypatch.setattr(pi, "MIN_PARALLEL_BYTES", 0)
+
+
+def test_split_array_yields_object_aligned_ranges():
+    buf = json.dumps(CARDS, indent=2).encode()
+    ranges = pi.split_array(buf, 4)
+
+    assert len(ranges) == 4
+    parsed = [card for lo, hi in ranges for card in json.loads(b"[" + buf[lo:hi] + b"]")]
+    assert parsed == CARDS
+    assert pi.split_array(b'{"not": "an array"}', 4) is None
+
+
+def test_parallel_load_matches_serial(tmp_path):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(CARDS, indent=2), encoding="utf-8")
+
+    assert pi.load_cards_parallel(src, workers=2) == ec.load_cards(src)
+
+
+def test_misaligned_split_falls_back_to_serial(tmp_path, capsys):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(CARDS, separators=(",", ":")), encoding="utf-8")
+
+    assert pi.load_cards_parallel(src, workers=4) == CARDS
+    assert "parsing serially" in capsys.readouterr().err
+
+
+def test_index_cards_reports_duplicates():
+    cards = [{"dbfId": 1, "name": "old"}, {"dbfId": 2}, {"dbfId": 1, "name": "new"}]
+
+    by_id, duplicates = pi.index_cards(cards)
+    assert duplicates == [1] and by_id[1]["name"] == "new"
+    assert pi.index_cards(cards, "first")[0][1]["name"] == "old"
+    with pytest.raises(ec.DataError):
+        pi.index_cards(cards, "error")
+
+
+def test_index_cards_skips_cards_without_dbf_id():
+    cards = [{"name": "no id"}, {"dbfId": 1}, {"name": "no id either"}, {"dbfId": 1}, {"dbfId": "7"}]
+
+    by_id, duplicates = pi.index_cards(cards)
+    assert list(by_id) == [1] and duplicates == [1]
+
+
+def test_build_index_files_writes_loadable_indexes(tmp_path):
+    sources = []
+    for locale in ("enUS", "deDE"):
+        src = tmp_path / f"cards.{locale}.json"
+        src.write_text(json.dumps(CARDS + CARDS[:1], indent=2), encoding="utf-8")
+        sources.append(src)
+
+    built = pi.build_index_files(sources, workers=2)
+
+    assert [dup for _, dup in built] == [[1], [1]]
+    assert ec.load_cards(built[1][0]) == CARDS
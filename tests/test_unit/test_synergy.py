@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+import extract_cards as ec
+from synergy import SynergyIndex
+
+CARDS = [
+    {"dbfId": 1, "name": "Taunt Buffer", "cardClass": "WARRIOR", "referencedTags": ["TAUNT"]},
+    {"dbfId": 2, "name": "Wall", "cardClass": "NEUTRAL", "mechanics": ["TAUNT"]},
+    {"dbfId": 3, "name": "Priest Wall", "cardClass": "PRIEST", "mechanics": ["TAUNT"]},
+    {"dbfId": 4, "name": "Rusher", "cardClass": "WARRIOR", "mechanics": ["RUSH"]},
+    {"dbfId": 5, "name": "Token Maker", "cardClass": "WARRIOR", "relatedCardDbfIds": [4]},
+]
+
+
+def test_wants_match_provides_and_related_cards_pair_up():
+    index = SynergyIndex.build(CARDS)
+
+    partners = [d for d, _ in index.top_k(1, k=5)]
+    assert set(partners) == {2, 3}
+    assert [d for d, _ in index.top_k(4, k=1)] == [5]
+    assert [d for d, _ in index.top_k(5, k=1)] == [4]
+
+
+def test_same_class_filter_keeps_neutral_partners():
+    index = SynergyIndex.build(CARDS)
+
+    assert [d for d, _ in index.top_k(1, k=5, same_class=True)] == [2]
+    with pytest.raises(ec.DataError):
+        index.top_k(999)
+
+
+def test_cache_is_reused_until_the_source_changes(tmp_path):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(CARDS), encoding="utf-8")
+    cache = tmp_path / "syn.npz"
+
+    first = SynergyIndex.for_source(src, cache)
+    stamp = cache.stat().st_mtime_ns
+    again = SynergyIndex.for_source(src, cache)
+    assert cache.stat().st_mtime_ns == stamp
+    assert again.top_k(1, k=5) == first.top_k(1, k=5)
+
+    src.write_text(json.dumps(CARDS + [{"dbfId": 6, "name": "New Wall", "mechanics": ["TAUNT"]}]), encoding="utf-8")
+    rebuilt = SynergyIndex.for_source(src, cache)
+    assert 6 in [d for d, _ in rebuilt.top_k(1, k=5)]
+
+
+def test_truncated_cache_is_rebuilt(tmp_path):
+    src = tmp_path / "cards.json"
+    src.write_text(json.dumps(CARDS), encoding="utf-8")
+    cache = tmp_path / "syn.npz"
+    expected = SynergyIndex.for_source(src, cache).top_k(1, k=5)
+
+    cache.write_bytes(cache.read_bytes()[:100])
+    assert SynergyIndex.load(cache) is None
+    assert SynergyIndex.for_source(src, cache).top_k(1, k=5) == expected
+    assert SynergyIndex.load(cache) is not None
+    assert not cache.with_name(cache.name + ".tmp").exists()